@@ -0,0 +1,52 @@
+# Lets pytest import custom_components.room_power_aggregator from the repo root.
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+T0 = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+class FakeStore:
+    """Stands in for homeassistant.helpers.storage.Store."""
+
+    def __init__(self, data=None):
+        self.data = data
+        self.delayed = []
+        self.saved = []
+
+    async def async_load(self):
+        return self.data
+
+    def async_delay_save(self, data_func, delay):
+        self.delayed.append(data_func)
+
+    async def async_save(self, data):
+        self.saved.append(data)
+
+
+@pytest.fixture
+def t0():
+    return T0
+
+
+@pytest.fixture
+def fake_store():
+    """Factory for a Store fake preloaded with `data`."""
+    return FakeStore
+
+
+@pytest.fixture
+def make_state():
+    """Factory for a State-like object `seconds` after t0."""
+
+    def _make(value, unit=None, seconds=0):
+        at = T0 + timedelta(seconds=seconds)
+        return SimpleNamespace(
+            state=value,
+            attributes={"unit_of_measurement": unit},
+            last_changed=at,
+            last_updated=at,
+        )
+
+    return _make
@@ -1,13 +1,19 @@
 from __future__ import annotations
 
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from typing import TYPE_CHECKING
 
 from .const import DOMAIN, PLATFORMS
 
+if TYPE_CHECKING:
+    # type-only, so the pure helper modules can be imported (and tested) without HA
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.core import HomeAssistant
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Room Power Aggregator from a config entry."""
+    from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+
     from .coordinator import RoomPowerCoordinator  # local import to avoid circulars
 
     coordinator = RoomPowerCoordinator(hass, entry)
@@ -16,7 +22,18 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
+    # entries are not unloaded when HA stops; flush the spool ourselves
+    # (baselines and costs get their final write from Store)
+    async def _async_close_spool(_event) -> None:
+        await coordinator.async_close_spool()
+
+    entry.async_on_unload(hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_close_spool))
+
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+
+    from .services import async_setup_services
+
+    await async_setup_services(hass)
     return True
 
 
@@ -25,8 +42,14 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
     if unload_ok:
-        hass.data.get(DOMAIN, {}).pop(entry.entry_id, None)
+        coordinator = hass.data.get(DOMAIN, {}).pop(entry.entry_id, None)
+        if coordinator is not None:
+            await coordinator.async_shutdown()
         if DOMAIN in hass.data and not hass.data[DOMAIN]:
             hass.data.pop(DOMAIN, None)
 
+            from .services import async_unload_services
+
+            await async_unload_services(hass)
+
     return unload_ok
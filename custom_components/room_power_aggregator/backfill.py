@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import logging
+from typing import Dict, Iterable, List, Tuple
+
+from homeassistant.components.recorder import get_instance, history
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    async_import_statistics,
+    get_last_statistics,
+    statistics_during_period,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util, slugify
+
+from .const import (
+    DOMAIN,
+    BACKFILL_CHUNK_HOURS,
+    BACKFILL_CHUNK_SOURCE_HOURS,
+    BACKFILL_TARGET_SENSOR,
+    CONF_INVERT_ENTITIES,
+    CONF_UNAVAILABLE_POLICY,
+    CONF_HOLD_TIMEOUT,
+    UNAVAILABLE_POLICY_ZERO,
+    DEFAULT_HOLD_TIMEOUT,
+    UNIT_FACTORS,
+)
+from .power_history import HourlyPower, hourly_group_power
+
+_LOGGER = logging.getLogger(__name__)
+
+HOUSE_KEY = "All Rooms"
+
+
+def _floor_hour(ts: datetime) -> datetime:
+    return ts.replace(minute=0, second=0, microsecond=0)
+
+
+def _fetch_chunk(
+    hass: HomeAssistant,
+    groups: Dict[str, List[Tuple[str, float]]],
+    factors: Dict[str, float],
+    start: datetime,
+    end: datetime,
+    policy: str,
+    hold_for: timedelta,
+) -> Dict[str, List[HourlyPower]]:
+    """Runs in the recorder executor: load one chunk and reduce it to hourly rows.
+
+    States are loaded as compressed rows without attributes (a small dict per
+    change instead of a State object) and never leave this function, so memory
+    is bounded by one chunk.
+    """
+    entity_ids = sorted({eid for members in groups.values() for eid, _ in members})
+    states = history.get_significant_states(
+        hass,
+        start,
+        end,
+        entity_ids,
+        include_start_time_state=True,
+        significant_changes_only=False,
+        minimal_response=True,
+        no_attributes=True,
+        compressed_state_format=True,
+    )
+    return {
+        name: hourly_group_power(states, members, factors, start, end, policy, hold_for)
+        for name, members in groups.items()
+    }
+
+
+# Windows searched backwards from `start` when re-backfilling over existing rows
+_SUM_LOOKBACK = (
+    timedelta(days=1),
+    timedelta(days=31),
+    timedelta(days=366),
+    timedelta(days=3660),
+)
+
+
+def _last_sum_before(hass: HomeAssistant, statistic_id: str, start: datetime) -> float:
+    """Runs in the recorder executor: latest cumulative energy sum before `start`.
+
+    Usually the newest row already precedes `start`. Only when it does not
+    (backfilling a range that was imported before) are growing windows before
+    `start` searched, so gaps in earlier imports never reset the sum to 0.
+    """
+    newest = get_last_statistics(hass, 1, statistic_id, False, {"sum"}).get(statistic_id)
+    if not newest:
+        return 0.0
+    if newest[0]["start"] < start.timestamp():
+        return float(newest[0].get("sum") or 0.0)
+
+    for window in _SUM_LOOKBACK:
+        rows = statistics_during_period(
+            hass, start - window, start, {statistic_id}, "hour", None, {"sum"}
+        ).get(statistic_id)
+        if rows:
+            return float(rows[-1].get("sum") or 0.0)
+
+    _LOGGER.warning(
+        "%s has statistics after %s but none before it; energy sum restarts at 0",
+        statistic_id,
+        start,
+    )
+    return 0.0
+
+
+async def async_backfill_room_statistics(
+    hass: HomeAssistant,
+    coordinator,
+    start: datetime,
+    end: datetime,
+    rooms: list[str] | None = None,
+    target: str = "external",
+) -> Dict[str, int]:
+    """Rebuild hourly room power/energy statistics from recorded source history.
+
+    The current room topology (coordinator.data) is applied to the whole
+    range. History is read in windows of at most BACKFILL_CHUNK_HOURS (fewer
+    with many sources) on the recorder executor and every chunk is imported
+    before the next one is read.
+    Returns the number of hours imported per room.
+    """
+    recorder = get_instance(hass)
+    start = _floor_hour(dt_util.as_utc(start))
+    end = _floor_hour(dt_util.as_utc(end))
+
+    def _members(entity_ids: Iterable[str]) -> List[Tuple[str, float]]:
+        # parent meters are net of their sub-meters, as in the live totals
+        entity_ids = set(entity_ids)
+        members = [(eid, 1.0) for eid in sorted(entity_ids)]
+        members += [
+            (child, -1.0)
+            for child, parent in sorted(coordinator.meter_parents.items())
+            if parent in entity_ids
+        ]
+        return members
+
+    groups: Dict[str, List[Tuple[str, float]]] = {
+        name: _members(eids)
+        for name, eids in coordinator.data.items()
+        if rooms is None or name in rooms
+    }
+    if rooms is None:
+        groups[HOUSE_KEY] = _members(eid for eids in coordinator.data.values() for eid in eids)
+    if not groups or start >= end:
+        return {}
+
+    cfg = {**coordinator.entry.data, **coordinator.entry.options}
+    inverted = set(cfg.get(CONF_INVERT_ENTITIES, []) or [])
+    policy = cfg.get(CONF_UNAVAILABLE_POLICY, UNAVAILABLE_POLICY_ZERO)
+    hold_for = timedelta(seconds=cfg.get(CONF_HOLD_TIMEOUT, DEFAULT_HOLD_TIMEOUT))
+    factors: Dict[str, float] = {}
+    for eid in {eid for members in groups.values() for eid, _ in members}:
+        st = hass.states.get(eid)
+        unit = st.attributes.get("unit_of_measurement") if st else None
+        factors[eid] = UNIT_FACTORS.get(unit, 1.0) * (-1.0 if eid in inverted else 1.0)
+
+    ent_reg = er.async_get(hass)
+    entry_id = coordinator.entry.entry_id
+    power_meta: Dict[str, StatisticMetaData] = {}
+    energy_meta: Dict[str, StatisticMetaData] = {}
+    for name in groups:
+        if target == BACKFILL_TARGET_SENSOR:
+            suffix = "all_rooms" if name == HOUSE_KEY else name
+            sensor_id = ent_reg.async_get_entity_id("sensor", DOMAIN, f"{DOMAIN}_{entry_id}_{suffix}")
+            if sensor_id is None:
+                _LOGGER.warning("No room sensor registered for %s, skipping backfill", name)
+                continue
+            power_meta[name] = StatisticMetaData(
+                has_mean=True,
+                has_sum=False,
+                name=None,
+                source="recorder",
+                statistic_id=sensor_id,
+                unit_of_measurement="W",
+            )
+            continue
+
+        object_id = slugify(f"{entry_id}_{name}")
+        power_meta[name] = StatisticMetaData(
+            has_mean=True,
+            has_sum=False,
+            name=f"{name} Power",
+            source=DOMAIN,
+            statistic_id=f"{DOMAIN}:{object_id}_power",
+            unit_of_measurement="W",
+        )
+        energy_meta[name] = StatisticMetaData(
+            has_mean=False,
+            has_sum=True,
+            name=f"{name} Energy",
+            source=DOMAIN,
+            statistic_id=f"{DOMAIN}:{object_id}_energy",
+            unit_of_measurement="kWh",
+        )
+
+    groups = {name: members for name, members in groups.items() if name in power_meta}
+
+    # Continue the cumulative energy sum from whatever precedes the range.
+    energy_sum: Dict[str, float] = {}
+    for name, meta in energy_meta.items():
+        energy_sum[name] = await recorder.async_add_executor_job(
+            _last_sum_before, hass, meta["statistic_id"], start
+        )
+
+    imported: Dict[str, int] = {name: 0 for name in groups}
+    # fewer hours per chunk the more sources are read, so one chunk holds
+    # about the same number of rows however large the house is
+    sources = len({eid for members in groups.values() for eid, _ in members})
+    chunk = timedelta(hours=max(1, min(BACKFILL_CHUNK_HOURS, BACKFILL_CHUNK_SOURCE_HOURS // max(sources, 1))))
+    chunk_start = start
+    while chunk_start < end:
+        chunk_end = min(chunk_start + chunk, end)
+        hourly = await recorder.async_add_executor_job(
+            _fetch_chunk, hass, groups, factors, chunk_start, chunk_end, policy, hold_for
+        )
+
+        for name, rows in hourly.items():
+            power_rows = [
+                StatisticData(start=r.start, mean=r.mean, min=r.min, max=r.max) for r in rows
+            ]
+            if target == BACKFILL_TARGET_SENSOR:
+                async_import_statistics(hass, power_meta[name], power_rows)
+            else:
+                async_add_external_statistics(hass, power_meta[name], power_rows)
+
+            if name in energy_meta:
+                energy_rows: List[StatisticData] = []
+                for r in rows:
+                    energy_sum[name] += r.mean / 1000.0
+                    energy_rows.append(
+                        StatisticData(start=r.start, state=energy_sum[name], sum=energy_sum[name])
+                    )
+                async_add_external_statistics(hass, energy_meta[name], energy_rows)
+
+            imported[name] += len(rows)
+
+        chunk_start = chunk_end
+
+    return imported
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict
+
+from .const import (
+    BASELINE_QUANTILE,
+    BASELINE_STEP,
+    BASELINE_WARMUP_SAMPLES,
+    BASELINE_WINDOW_SAMPLES,
+    BASELINE_EWMA_FALL,
+    BASELINE_EWMA_RISE,
+    BASELINE_SAVE_DELAY,
+)
+
+if TYPE_CHECKING:
+    from homeassistant.helpers.storage import Store
+
+STORAGE_VERSION = 1
+STORAGE_KEY = "room_power_aggregator_baseline_{}"
+
+
+class BaselineEstimator:
+    """Streaming low-quantile estimate of a power signal in O(1) memory.
+
+    The quantile is tracked by stochastic approximation: each sample nudges
+    the estimate down by (1 - q) * step when below it and up by q * step
+    otherwise. The step scales with the mean deviation of samples *below* the
+    estimate only, so the on-phase of duty-cycled loads (fridge, boiler) never
+    widens it, with a floor of 1% of the estimate. The estimate is never allowed below the observed minimum.
+
+    Small upward steps alone would take days to follow a baseline that rose
+    (a device added to a room), so the minimum of every BASELINE_WINDOW_SAMPLES
+    window is kept as well: if no sample in a window went below the estimate,
+    the estimate jumps to that window's minimum. Until BASELINE_WARMUP_SAMPLES
+    have been seen, an asymmetric EWMA (falls fast, rises slowly) is reported
+    instead.
+    """
+
+    __slots__ = ("estimate", "scale", "low_ewma", "minimum", "count", "window_min", "window_count")
+
+    def __init__(
+        self,
+        estimate: float = 0.0,
+        scale: float = 0.0,
+        low_ewma: float = 0.0,
+        minimum: float = 0.0,
+        count: int = 0,
+        window_min: float = 0.0,
+        window_count: int = 0,
+    ) -> None:
+        self.estimate = estimate
+        self.scale = scale
+        self.low_ewma = low_ewma
+        self.minimum = minimum
+        self.count = count
+        self.window_min = window_min
+        self.window_count = window_count
+
+    def update(self, x: float) -> None:
+        if self.count == 0:
+            self.estimate = self.low_ewma = self.minimum = self.window_min = x
+            self.scale = max(abs(x) * 0.1, 1.0)
+            self.count = self.window_count = 1
+            return
+        self.count += 1
+        if x < self.minimum:
+            self.minimum = x
+        if self.window_count == 0 or x < self.window_min:
+            self.window_min = x
+        self.window_count += 1
+
+        alpha = BASELINE_EWMA_FALL if x < self.low_ewma else BASELINE_EWMA_RISE
+        self.low_ewma += alpha * (x - self.low_ewma)
+
+        if x < self.estimate:
+            self.scale += BASELINE_EWMA_RISE * ((self.estimate - x) - self.scale)
+        # a flat signal shrinks the scale to nothing; keep a step relative to the level
+        step = BASELINE_STEP * max(self.scale, 0.01 * abs(self.estimate), 0.1)
+        if x < self.estimate:
+            self.estimate -= step * (1.0 - BASELINE_QUANTILE)
+            if self.estimate < self.minimum:
+                self.estimate = self.minimum
+        else:
+            self.estimate += step * BASELINE_QUANTILE
+
+        if self.window_count >= BASELINE_WINDOW_SAMPLES:
+            if self.window_min > self.estimate:
+                self.estimate = self.window_min
+            self.window_count = 0
+
+    @property
+    def value(self) -> float | None:
+        if self.count == 0:
+            return None
+        if self.count < BASELINE_WARMUP_SAMPLES:
+            return self.low_ewma
+        return self.estimate
+
+    def as_dict(self) -> dict:
+        return {
+            "e": self.estimate,
+            "s": self.scale,
+            "l": self.low_ewma,
+            "m": self.minimum,
+            "n": self.count,
+            "w": self.window_min,
+            "wn": self.window_count,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> BaselineEstimator:
+        estimate = float(data["e"])
+        return cls(
+            estimate,
+            float(data["s"]),
+            float(data["l"]),
+            float(data.get("m", estimate)),
+            int(data["n"]),
+            float(data.get("w", estimate)),
+            int(data.get("wn", 0)),
+        )
+
+
+class BaselineTracker:
+    """Per-entity, per-room and house baseline estimators, checkpointed daily.
+
+    Persistence goes through Store.async_delay_save, which also writes the
+    pending checkpoint when Home Assistant stops.
+    """
+
+    def __init__(self, store: Store) -> None:
+        self._store = store
+        self.entities: Dict[str, BaselineEstimator] = {}
+        self.rooms: Dict[str, BaselineEstimator] = {}
+        self.house = BaselineEstimator()
+        self._loaded = False
+        self._save_pending = False
+        self._live_entities: set[str] | None = None
+        self._live_rooms: set[str] | None = None
+
+    async def async_load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        data = await self._store.async_load() or {}
+        self.entities = {k: BaselineEstimator.from_dict(v) for k, v in data.get("entities", {}).items()}
+        self.rooms = {k: BaselineEstimator.from_dict(v) for k, v in data.get("rooms", {}).items()}
+        if "house" in data:
+            self.house = BaselineEstimator.from_dict(data["house"])
+
+    def update(self, snapshot) -> None:
+        """Feed one snapshot and write the current baselines back onto it."""
+        entities = self.entities
+        for eid, watts in snapshot.device_power_w.items():
+            if watts is None:
+                continue
+            est = entities.get(eid)
+            if est is None:
+                est = entities[eid] = BaselineEstimator()
+            est.update(watts)
+            snapshot.device_baseline_w[eid] = est.value
+
+        rooms = self.rooms
+        for room, watts in snapshot.room_totals_w.items():
+            est = rooms.get(room)
+            if est is None:
+                est = rooms[room] = BaselineEstimator()
+            est.update(watts)
+            snapshot.room_baseline_w[room] = est.value
+
+        self.house.update(snapshot.house_w)
+        snapshot.house_baseline_w = self.house.value
+
+        self._live_entities = set(snapshot.device_power_w)
+        self._live_rooms = set(snapshot.room_totals_w)
+        if self._loaded and not self._save_pending:
+            self._save_pending = True
+            self._store.async_delay_save(self._data_to_save, BASELINE_SAVE_DELAY)
+
+    def _data_to_save(self) -> dict:
+        """Checkpoint payload, dropping estimators for vanished sources."""
+        self._save_pending = False
+        if self._live_entities is not None:
+            self.entities = {k: v for k, v in self.entities.items() if k in self._live_entities}
+            self.rooms = {k: v for k, v in self.rooms.items() if k in self._live_rooms}
+        return {
+            "entities": {k: v.as_dict() for k, v in self.entities.items()},
+            "rooms": {k: v.as_dict() for k, v in self.rooms.items()},
+            "house": self.house.as_dict(),
+        }
+
+    async def async_save(self) -> None:
+        """Write immediately (entry unload); never before the stored data was loaded."""
+        if not self._loaded:
+            return
+        await self._store.async_save(self._data_to_save())
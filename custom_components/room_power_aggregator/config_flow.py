@@ -14,6 +14,17 @@ from .const import (
     CONF_SUPPLY_ENTITIES,
     CONF_CONSUME_ENTITIES,
     CONF_HIDE_DEVICES_COLUMN,
+    CONF_EXPORT_FORMAT,
+    CONF_EXPORT_DEVICES,
+    EXPORT_FORMAT_NONE,
+    EXPORT_FORMATS,
+    CONF_INVERT_ENTITIES,
+    CONF_UNAVAILABLE_POLICY,
+    CONF_HOLD_TIMEOUT,
+    UNAVAILABLE_POLICY_ZERO,
+    UNAVAILABLE_POLICIES,
+    DEFAULT_HOLD_TIMEOUT,
+    CONF_PRICE_ENTITY,
 )
 
 
@@ -40,6 +51,13 @@ class RoomPowerAggregatorConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     selector.EntitySelectorConfig(domain=["sensor"], multiple=True)
                 ),
                 vol.Optional(CONF_HIDE_DEVICES_COLUMN, default=False): bool,
+                vol.Optional(CONF_EXPORT_FORMAT, default=EXPORT_FORMAT_NONE): vol.In(EXPORT_FORMATS),
+                vol.Optional(CONF_EXPORT_DEVICES, default=False): bool,
+                vol.Optional(CONF_INVERT_ENTITIES, default=[]): selector.EntitySelector(
+                    selector.EntitySelectorConfig(domain=["sensor"], multiple=True)
+                ),
+                vol.Optional(CONF_UNAVAILABLE_POLICY, default=UNAVAILABLE_POLICY_ZERO): vol.In(UNAVAILABLE_POLICIES),
+                vol.Optional(CONF_HOLD_TIMEOUT, default=DEFAULT_HOLD_TIMEOUT): vol.All(vol.Coerce(int), vol.Range(min=0)),
             }
         )
         return self.async_show_form(step_id="user", data_schema=schema)
@@ -73,6 +91,19 @@ class RoomPowerAggregatorOptionsFlowHandler(config_entries.OptionsFlow):
                     selector.EntitySelectorConfig(domain=["sensor"], multiple=True)
                 ),
                 vol.Optional(CONF_HIDE_DEVICES_COLUMN, default=data.get(CONF_HIDE_DEVICES_COLUMN, False)): bool,
+                vol.Optional(CONF_EXPORT_FORMAT, default=data.get(CONF_EXPORT_FORMAT, EXPORT_FORMAT_NONE)): vol.In(EXPORT_FORMATS),
+                vol.Optional(CONF_EXPORT_DEVICES, default=data.get(CONF_EXPORT_DEVICES, False)): bool,
+                vol.Optional(CONF_INVERT_ENTITIES, default=data.get(CONF_INVERT_ENTITIES, [])): selector.EntitySelector(
+                    selector.EntitySelectorConfig(domain=["sensor"], multiple=True)
+                ),
+                vol.Optional(CONF_UNAVAILABLE_POLICY, default=data.get(CONF_UNAVAILABLE_POLICY, UNAVAILABLE_POLICY_ZERO)): vol.In(UNAVAILABLE_POLICIES),
+                vol.Optional(CONF_HOLD_TIMEOUT, default=data.get(CONF_HOLD_TIMEOUT, DEFAULT_HOLD_TIMEOUT)): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                vol.Optional(
+                    CONF_PRICE_ENTITY,
+                    description={"suggested_value": data.get(CONF_PRICE_ENTITY)},
+                ): selector.EntitySelector(
+                    selector.EntitySelectorConfig(domain=["sensor", "input_number"])
+                ),
             }
         )
         return self.async_show_form(step_id="init", data_schema=schema)
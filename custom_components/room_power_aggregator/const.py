@@ -23,3 +23,62 @@ CONF_CONSUME_ENTITIES = "consume_entities"
 CONF_HIDE_DEVICES_COLUMN = "hide_devices_column"
 
 CONF_TREE_SENSOR = "tree_sensor"
+
+# Source reading
+CONF_INVERT_ENTITIES = "invert_entities"
+CONF_UNAVAILABLE_POLICY = "unavailable_policy"
+CONF_HOLD_TIMEOUT = "hold_timeout"
+UNAVAILABLE_POLICY_ZERO = "zero"
+UNAVAILABLE_POLICY_HOLD = "hold"
+UNAVAILABLE_POLICY_DEGRADED = "degraded"
+UNAVAILABLE_POLICIES = [UNAVAILABLE_POLICY_ZERO, UNAVAILABLE_POLICY_HOLD, UNAVAILABLE_POLICY_DEGRADED]
+DEFAULT_HOLD_TIMEOUT = 300  # seconds
+
+# Energy cost
+CONF_PRICE_ENTITY = "price_entity"
+COST_MAX_GAP = 60  # seconds; longer gaps between refreshes are not integrated
+COST_SAVE_DELAY = 300  # seconds; also written when HA stops
+
+# Accepted power units and their factor to W; kW/MW are gated by CONF_INCLUDE_KW
+UNIT_FACTORS = {"mW": 0.001, "W": 1.0, "kW": 1000.0, "MW": 1_000_000.0}
+LARGE_UNITS = ("kW", "MW")
+
+# Time-series spool export
+CONF_EXPORT_FORMAT = "export_format"
+CONF_EXPORT_DEVICES = "export_devices"
+EXPORT_FORMAT_NONE = "none"
+EXPORT_FORMAT_LINE_PROTOCOL = "line_protocol"
+EXPORT_FORMAT_CSV = "csv"
+EXPORT_FORMATS = [EXPORT_FORMAT_NONE, EXPORT_FORMAT_LINE_PROTOCOL, EXPORT_FORMAT_CSV]
+
+SPOOL_FLUSH_BYTES = 256 * 1024
+SPOOL_FLUSH_SECONDS = 60
+SPOOL_ROTATE_BYTES = 16 * 1024 * 1024
+SPOOL_ROTATE_SECONDS = 300
+SPOOL_MAX_BUFFER_BYTES = 4 * 1024 * 1024
+
+# Services
+SERVICE_GET_BREAKDOWN = "get_breakdown"
+SERVICE_BACKFILL_STATISTICS = "backfill_statistics"
+ATTR_ENTRY_ID = "entry_id"
+ATTR_TOP_N = "top_n"
+ATTR_START_TIME = "start_time"
+ATTR_END_TIME = "end_time"
+ATTR_ROOMS = "rooms"
+ATTR_TARGET = "target"
+DEFAULT_TOP_N = 5
+
+# Backfill: hours of recorder history loaded per executor job
+BACKFILL_CHUNK_HOURS = 6
+BACKFILL_CHUNK_SOURCE_HOURS = 600  # sources × hours read per chunk
+BACKFILL_TARGET_EXTERNAL = "external"
+BACKFILL_TARGET_SENSOR = "sensor"
+
+# Baseline (standby) power estimation; updated once per refresh
+BASELINE_QUANTILE = 0.05
+BASELINE_STEP = 0.05
+BASELINE_WARMUP_SAMPLES = 720  # one hour at UPDATE_INTERVAL
+BASELINE_WINDOW_SAMPLES = 6 * 720  # six hours; a window never below the estimate lifts it
+BASELINE_EWMA_FALL = 0.2
+BASELINE_EWMA_RISE = 0.001
+BASELINE_SAVE_DELAY = 24 * 3600  # seconds; also written when HA stops
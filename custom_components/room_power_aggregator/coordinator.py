@@ -1,19 +1,37 @@
 from __future__ import annotations
 
-from datetime import timedelta
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
 import logging
 from typing import Dict, List
 
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.util import dt as dt_util
 
 from homeassistant.helpers import (
     area_registry as ar,
     device_registry as dr,
     entity_registry as er,
+    floor_registry as fr,
     label_registry as lr,
 )
 
 from .yaml_exporter import build_sankey_yaml, export_sankey_yaml_if_changed
+from .spool_exporter import SnapshotSpool
+from .baseline import (
+    BaselineTracker,
+    STORAGE_KEY as BASELINE_STORAGE_KEY,
+    STORAGE_VERSION as BASELINE_STORAGE_VERSION,
+)
+from .source_reader import SourceReader
+from .hierarchy import PowerTree
+from .cost import (
+    CostTracker,
+    parse_price,
+    STORAGE_KEY as COST_STORAGE_KEY,
+    STORAGE_VERSION as COST_STORAGE_VERSION,
+)
 
 from .const import (
     DOMAIN,
@@ -22,9 +40,49 @@ from .const import (
     CONF_ONLY_POWER_DEVICE_CLASS,
     CONF_INCLUDE_KW,
     CONF_DEBUG,
+    CONF_SUPPLY_ENTITIES,
+    CONF_CONSUME_ENTITIES,
+    CONF_EXPORT_FORMAT,
+    CONF_EXPORT_DEVICES,
+    EXPORT_FORMAT_NONE,
+    CONF_INVERT_ENTITIES,
+    CONF_UNAVAILABLE_POLICY,
+    CONF_HOLD_TIMEOUT,
+    UNAVAILABLE_POLICY_ZERO,
+    DEFAULT_HOLD_TIMEOUT,
+    UNIT_FACTORS,
+    LARGE_UNITS,
+    CONF_PRICE_ENTITY,
 )
 
 
+@dataclass
+class PowerSnapshot:
+    """Power values read once per refresh; sensors and services share it."""
+
+    timestamp: datetime
+    device_power_w: Dict[str, float | None] = field(default_factory=dict)
+    room_totals_w: Dict[str, float] = field(default_factory=dict)
+    floor_totals_w: Dict[str, float] = field(default_factory=dict)
+    supply_power_w: Dict[str, float | None] = field(default_factory=dict)
+    consume_power_w: Dict[str, float | None] = field(default_factory=dict)
+    house_w: float = 0.0
+    supply_w: float = 0.0
+    consume_w: float = 0.0
+    unaccounted_w: float = 0.0
+    device_baseline_w: Dict[str, float | None] = field(default_factory=dict)
+    room_baseline_w: Dict[str, float | None] = field(default_factory=dict)
+    house_baseline_w: float | None = None
+    unavailable_sources: Dict[str, List[str]] = field(default_factory=dict)
+    degraded_rooms: set[str] = field(default_factory=set)
+    price_per_kwh: float | None = None
+    currency: str | None = None
+    room_cost_rate: Dict[str, float] = field(default_factory=dict)
+    room_cost_total: Dict[str, float] = field(default_factory=dict)
+    house_cost_rate: float = 0.0
+    house_cost_total: float = 0.0
+
+
 class RoomPowerCoordinator(DataUpdateCoordinator):
     """Scans all rooms and determines which sensors should exist."""
 
@@ -36,6 +94,119 @@ class RoomPowerCoordinator(DataUpdateCoordinator):
             update_interval=timedelta(seconds=UPDATE_INTERVAL),
         )
         self.entry = entry
+        self.snapshot: PowerSnapshot | None = None
+        self.spool: SnapshotSpool | None = None
+        self.baseline = BaselineTracker(
+            Store(hass, BASELINE_STORAGE_VERSION, BASELINE_STORAGE_KEY.format(entry.entry_id))
+        )
+        self.cost = CostTracker(
+            Store(hass, COST_STORAGE_VERSION, COST_STORAGE_KEY.format(entry.entry_id))
+        )
+        self._readers: Dict[str, SourceReader] = {}
+        # Topology beyond the flat rooms map (coordinator.data)
+        self.room_floors: Dict[str, str] = {}
+        self.meter_parents: Dict[str, str] = {}
+        self._tree: PowerTree | None = None
+        self._tree_topology: tuple | None = None
+
+    def _sync_readers(self, rooms: Dict[str, List[str]], cfg: dict) -> None:
+        """Keep one reader per current source; rebuild those whose sign changed."""
+        inverted = set(cfg.get(CONF_INVERT_ENTITIES, []) or [])
+        wanted = {eid for eids in rooms.values() for eid in eids}
+        wanted.update(cfg.get(CONF_SUPPLY_ENTITIES, []) or [])
+        wanted.update(cfg.get(CONF_CONSUME_ENTITIES, []) or [])
+
+        readers: Dict[str, SourceReader] = {}
+        for eid in wanted:
+            sign = -1.0 if eid in inverted else 1.0
+            reader = self._readers.get(eid)
+            if reader is None or reader.sign != sign:
+                reader = SourceReader(eid, sign)
+            readers[eid] = reader
+        self._readers = readers
+
+    def _build_snapshot(self, rooms: Dict[str, List[str]]) -> PowerSnapshot:
+        """Read every source once and derive room/house/unaccounted totals."""
+        cfg = {**self.entry.data, **self.entry.options}
+        self._sync_readers(rooms, cfg)
+        snap = PowerSnapshot(timestamp=dt_util.utcnow())
+
+        policy = cfg.get(CONF_UNAVAILABLE_POLICY, UNAVAILABLE_POLICY_ZERO)
+        hold_for = timedelta(seconds=cfg.get(CONF_HOLD_TIMEOUT, DEFAULT_HOLD_TIMEOUT))
+        now = snap.timestamp
+        get_state = self.hass.states.get
+        readers = self._readers
+
+        def _read(eid: str) -> float | None:
+            return readers[eid].read(get_state(eid), now, policy, hold_for)
+
+        topology = (rooms, self.room_floors, self.meter_parents)
+        if self._tree is None or self._tree_topology != topology:
+            self._tree = PowerTree(rooms, self.room_floors, self.meter_parents)
+            self._tree_topology = topology
+        tree = self._tree
+
+        # read every source before taking any total: a sub-meter in a later
+        # room still changes the net total of its parent meter's room
+        readings: Dict[str, float] = {}
+        for area_name, entity_ids in rooms.items():
+            for eid in entity_ids:
+                if eid not in snap.device_power_w:
+                    watts = snap.device_power_w[eid] = _read(eid)
+                    readings[eid] = watts if watts is not None else 0.0
+                if not readers[eid].available:
+                    snap.unavailable_sources.setdefault(area_name, []).append(eid)
+                    if snap.device_power_w[eid] is None and policy != UNAVAILABLE_POLICY_ZERO:
+                        snap.degraded_rooms.add(area_name)
+        tree.update(readings)
+
+        for area_name in rooms:
+            snap.room_totals_w[area_name] = tree.room_total(area_name)
+        for floor in set(self.room_floors.values()):
+            snap.floor_totals_w[floor] = tree.floor_total(floor)
+        snap.house_w = tree.house_total
+
+        for eid in cfg.get(CONF_SUPPLY_ENTITIES, []) or []:
+            snap.supply_power_w[eid] = _read(eid)
+        for eid in cfg.get(CONF_CONSUME_ENTITIES, []) or []:
+            snap.consume_power_w[eid] = _read(eid)
+        snap.supply_w = sum(w for w in snap.supply_power_w.values() if w is not None)
+        snap.consume_w = sum(w for w in snap.consume_power_w.values() if w is not None)
+
+        snap.unaccounted_w = max(snap.supply_w - snap.house_w - snap.consume_w, 0.0)
+
+        price_entity = cfg.get(CONF_PRICE_ENTITY)
+        if price_entity:
+            price, currency = parse_price(get_state(price_entity), self.hass.config.currency)
+            self.cost.update(snap, price, currency)
+        return snap
+
+    async def _async_export_snapshot(self, rooms: Dict[str, List[str]]) -> None:
+        """Feed the snapshot to the spool, (re)creating it when options changed."""
+        cfg = {**self.entry.data, **self.entry.options}
+        fmt = cfg.get(CONF_EXPORT_FORMAT, EXPORT_FORMAT_NONE)
+        include_devices = bool(cfg.get(CONF_EXPORT_DEVICES, False))
+
+        if self.spool is not None and (self.spool.fmt != fmt or self.spool.include_devices != include_devices):
+            await self.async_close_spool()
+        if fmt == EXPORT_FORMAT_NONE:
+            return
+        if self.spool is None:
+            self.spool = SnapshotSpool(self.hass, self.entry.entry_id, fmt, include_devices)
+        self.spool.async_append(self.snapshot, rooms)
+
+    async def async_close_spool(self) -> None:
+        """Flush and rotate the spool (entry unload and Home Assistant stop)."""
+        if self.spool is not None:
+            spool, self.spool = self.spool, None
+            await spool.async_close()
+
+    async def async_shutdown(self) -> None:
+        """Flush the spool, baselines and cost totals before the coordinator goes away."""
+        await super().async_shutdown()
+        await self.baseline.async_save()
+        await self.cost.async_save()
+        await self.async_close_spool()
 
     async def _async_update_data(self) -> Dict[str, List[str]]:
         data = {**self.entry.data, **self.entry.options}
@@ -57,7 +228,11 @@ class RoomPowerCoordinator(DataUpdateCoordinator):
                 if label.name == label_name
             }
 
+        fr_reg = fr.async_get(self.hass)
+
         rooms: Dict[str, List[str]] = {}
+        room_floors: Dict[str, str] = {}
+        source_devices: Dict[str, str] = {}
 
         for ent in er_reg.entities.values():
             if not ent.entity_id.startswith("sensor."):
@@ -76,9 +251,9 @@ class RoomPowerCoordinator(DataUpdateCoordinator):
             device_class = state.attributes.get("device_class")
             unit = state.attributes.get("unit_of_measurement")
 
-            if unit not in ("W", "kW"):
+            if unit not in UNIT_FACTORS:
                 continue
-            if unit == "kW" and not include_kw:
+            if unit in LARGE_UNITS and not include_kw:
                 continue
 
             if only_power and device_class is not None and device_class != "power":
@@ -100,10 +275,48 @@ class RoomPowerCoordinator(DataUpdateCoordinator):
             area_name = area.name if area else area_id
 
             rooms.setdefault(area_name, []).append(ent.entity_id)
+            if ent.device_id:
+                source_devices[ent.entity_id] = ent.device_id
+
+            floor_id = getattr(area, "floor_id", None)
+            floor = fr_reg.async_get_floor(floor_id) if floor_id else None
+            if floor is not None:
+                room_floors[area_name] = floor.name
+
+        # Sub-meters: a source whose device is (transitively) connected via a
+        # device that has its own source is subtracted from that parent meter.
+        source_by_device: Dict[str, str] = {}
+        for eid in sorted(source_devices):
+            source_by_device.setdefault(source_devices[eid], eid)
+
+        meter_parents: Dict[str, str] = {}
+        for eid, device_id in source_devices.items():
+            seen = {device_id}
+            dev = dr_reg.devices.get(device_id)
+            via = dev.via_device_id if dev else None
+            while via and via not in seen:
+                seen.add(via)
+                parent = source_by_device.get(via)
+                if parent is not None and parent != eid:
+                    meter_parents[eid] = parent
+                    break
+                dev = dr_reg.devices.get(via)
+                via = dev.via_device_id if dev else None
+
+        self.room_floors = room_floors
+        self.meter_parents = meter_parents
 
         if debug:
             self.logger.warning("ROOM POWER SCAN RESULT: %s", rooms)
-        # Generate Sankey YAML export (rooms/devices + supply/consume/unaccounted) and notify on changes.
+            self.logger.warning("ROOM POWER FLOORS: %s SUB-METERS: %s", room_floors, meter_parents)
+
+        await self.baseline.async_load()
+        await self.cost.async_load()
+        self.snapshot = self._build_snapshot(rooms)
+        self.baseline.update(self.snapshot)
+        await self._async_export_snapshot(rooms)
+
+        # Generate Sankey YAML export (floors/rooms/devices + supply/consume/unaccounted) and notify on changes.
         try:
             cfg = {**self.entry.data, **self.entry.options}
 
@@ -136,6 +349,13 @@ class RoomPowerCoordinator(DataUpdateCoordinator):
                     f"sensor.{area_name.lower().replace(' ', '_')}_power_total",
                 )
 
+            floor_totals: Dict[str, str] = {}
+            for floor_name in set(room_floors.values()):
+                floor_totals[floor_name] = _resolve_by_unique_id(
+                    f"{DOMAIN}_{self.entry.entry_id}_floor_{floor_name}",
+                    f"sensor.{floor_name.lower().replace(' ', '_')}_power_total",
+                )
+
             yaml_text = build_sankey_yaml(
                 house_total_entity_id=house_total_entity_id,
                 unaccounted_entity_id=unaccounted_entity_id,
@@ -144,6 +364,8 @@ class RoomPowerCoordinator(DataUpdateCoordinator):
                 room_totals=room_totals,
                 rooms_to_device_entities=rooms,
                 hide_devices_column=hide_devices_column,
+                floor_totals=floor_totals,
+                room_floors=room_floors,
             )
             await export_sankey_yaml_if_changed(self.hass, self.entry.entry_id, yaml_text)
         except Exception as err:  # noqa: BLE001
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+from datetime import datetime
+import logging
+import re
+from typing import TYPE_CHECKING, Dict
+
+from .const import COST_MAX_GAP, COST_SAVE_DELAY
+
+if TYPE_CHECKING:
+    from homeassistant.core import State
+    from homeassistant.helpers.storage import Store
+
+STORAGE_VERSION = 1
+STORAGE_KEY = "room_power_aggregator_cost_{}"
+
+_LOGGER = logging.getLogger(__name__)
+
+# Price unit suffix → factor to price per kWh
+_ENERGY_UNIT_FACTORS = {"/Wh": 1000.0, "/kWh": 1.0, "/MWh": 0.001}
+# Currency symbols and minor units (→ factor to the main unit). Neither is an
+# ISO 4217 code, so the Home Assistant currency is used with them.
+_CURRENCY_SYMBOLS = {"": 1.0, "€": 1.0, "$": 1.0, "£": 1.0, "kr": 1.0, "zł": 1.0}
+_MINOR_UNITS = {"ct": 0.01, "c": 0.01, "cent": 0.01, "cents": 0.01, "öre": 0.01, "øre": 0.01, "p": 0.01}
+_ISO_CURRENCY = re.compile(r"[A-Z]{3}")
+
+_warned_units: set[str] = set()
+
+
+def parse_price(state: State | None, default_currency: str | None) -> tuple[float | None, str | None]:
+    """Price per kWh and its currency from a tariff entity state.
+
+    The unit is `<currency>/<energy unit>`; without an energy unit the price
+    is taken per kWh. The currency part may be an ISO 4217 code, a symbol or
+    a minor unit (ct, öre, p, ...). Unknown units give no price.
+    """
+    if state is None:
+        return None, default_currency
+    try:
+        price = float(state.state)
+    except (ValueError, TypeError):
+        return None, default_currency
+
+    unit = state.attributes.get("unit_of_measurement") or ""
+    prefix = unit
+    for suffix, factor in _ENERGY_UNIT_FACTORS.items():
+        if unit.endswith(suffix):
+            price *= factor
+            prefix = unit[: -len(suffix)]
+            break
+    prefix = prefix.strip()
+
+    if _ISO_CURRENCY.fullmatch(prefix):
+        return price, prefix
+    key = prefix.lower()
+    if key in _CURRENCY_SYMBOLS:
+        return price * _CURRENCY_SYMBOLS[key], default_currency
+    if key in _MINOR_UNITS:
+        return price * _MINOR_UNITS[key], default_currency
+
+    if unit not in _warned_units:
+        _warned_units.add(unit)
+        _LOGGER.warning("Unsupported price unit %r; expected e.g. EUR/kWh or ct/kWh", unit)
+    return None, default_currency
+
+
+class CostTracker:
+    """Per-room and house cost rate and accumulated cost.
+
+    Each refresh integrates the rates of the previous refresh over the elapsed
+    time (rates are constant between samples) and then computes the new rates
+    as room watts × price in one pass. Totals are persisted through
+    Store.async_delay_save at most every COST_SAVE_DELAY seconds, when Home
+    Assistant stops and on unload; gaps longer than COST_MAX_GAP (e.g. a
+    restart) are not integrated.
+    """
+
+    def __init__(self, store: Store) -> None:
+        self._store = store
+        self.room_totals: Dict[str, float] = {}
+        self.house_total = 0.0
+        self._room_rates: Dict[str, float] = {}
+        self._house_rate = 0.0
+        self._last_ts: datetime | None = None
+        self._loaded = False
+        self._save_pending = False
+
+    async def async_load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        data = await self._store.async_load() or {}
+        self.room_totals = {k: float(v) for k, v in data.get("rooms", {}).items()}
+        self.house_total = float(data.get("house", 0.0))
+
+    def update(self, snapshot, price_per_kwh: float | None, currency: str | None) -> None:
+        """Accumulate since the last refresh and write rates/totals onto the snapshot."""
+        now = snapshot.timestamp
+        if self._last_ts is not None:
+            elapsed = (now - self._last_ts).total_seconds()
+            if 0 < elapsed <= COST_MAX_GAP:
+                hours = elapsed / 3600.0
+                totals = self.room_totals
+                for room, rate in self._room_rates.items():
+                    totals[room] = totals.get(room, 0.0) + rate * hours
+                self.house_total += self._house_rate * hours
+        self._last_ts = now
+
+        if price_per_kwh is None:
+            self._room_rates = {}
+            self._house_rate = 0.0
+        else:
+            per_w = price_per_kwh / 1000.0
+            self._room_rates = {room: w * per_w for room, w in snapshot.room_totals_w.items()}
+            self._house_rate = snapshot.house_w * per_w
+
+        snapshot.price_per_kwh = price_per_kwh
+        snapshot.currency = currency
+        snapshot.room_cost_rate = dict(self._room_rates)
+        snapshot.house_cost_rate = self._house_rate
+        snapshot.room_cost_total = {room: self.room_totals.get(room, 0.0) for room in snapshot.room_totals_w}
+        snapshot.house_cost_total = self.house_total
+
+        if self._loaded and not self._save_pending:
+            self._save_pending = True
+            self._store.async_delay_save(self._data_to_save, COST_SAVE_DELAY)
+
+    def _data_to_save(self) -> dict:
+        self._save_pending = False
+        return {"rooms": dict(self.room_totals), "house": self.house_total}
+
+    async def async_save(self) -> None:
+        """Write immediately (entry unload); never before the stored data was loaded."""
+        if not self._loaded:
+            return
+        await self._store.async_save(self._data_to_save())
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from typing import Dict, List, Tuple
+
+NodeKey = Tuple[str, ...]
+
+HOUSE: NodeKey = ("house",)
+
+
+def room_key(name: str) -> NodeKey:
+    return ("room", name)
+
+
+def floor_key(name: str) -> NodeKey:
+    return ("floor", name)
+
+
+class PowerTree:
+    """House → floor → room totals maintained by delta propagation.
+
+    Every source carries the chain of nodes its reading is added to. A
+    sub-meter additionally carries its parent meter's chain, which it is
+    subtracted from, so parent meters count net of their children. Setting
+    a source touches at most two chains: O(depth) per changed reading.
+    """
+
+    def __init__(
+        self,
+        rooms: Dict[str, List[str]],
+        room_floors: Dict[str, str],
+        meter_parents: Dict[str, str],
+    ) -> None:
+        self.totals: Dict[NodeKey, float] = {HOUSE: 0.0}
+        self._reading: Dict[str, float] = {}
+        self._chain: Dict[str, List[NodeKey]] = {}
+
+        for room, entity_ids in rooms.items():
+            chain = [room_key(room)]
+            floor = room_floors.get(room)
+            if floor is not None:
+                chain.append(floor_key(floor))
+            chain.append(HOUSE)
+            for key in chain:
+                self.totals.setdefault(key, 0.0)
+            for eid in entity_ids:
+                self._chain.setdefault(eid, chain)
+                self._reading[eid] = 0.0
+
+        self._parent_chain: Dict[str, List[NodeKey]] = {
+            eid: self._chain[parent]
+            for eid, parent in meter_parents.items()
+            if eid in self._chain and parent in self._chain
+        }
+
+    def set(self, entity_id: str, watts: float) -> None:
+        """Record a new reading and push its delta up the tree."""
+        delta = watts - self._reading[entity_id]
+        if not delta:
+            return
+        self._reading[entity_id] = watts
+        totals = self.totals
+        for key in self._chain[entity_id]:
+            totals[key] += delta
+        for key in self._parent_chain.get(entity_id, ()):
+            totals[key] -= delta
+
+    def update(self, readings: Dict[str, float]) -> None:
+        """Record a whole refresh of readings.
+
+        A sub-meter changes its parent meter's room, which may come later in
+        the room order, so totals must only be read once every reading of the
+        refresh has been set.
+        """
+        for entity_id, watts in readings.items():
+            self.set(entity_id, watts)
+
+    def room_total(self, room: str) -> float:
+        return self.totals.get(room_key(room), 0.0)
+
+    def floor_total(self, floor: str) -> float:
+        return self.totals.get(floor_key(floor), 0.0)
+
+    @property
+    def house_total(self) -> float:
+        return self.totals[HOUSE]
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Dict, List, Set
+from typing import List
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
@@ -12,9 +12,16 @@ from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import area_registry as ar, entity_registry as er
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-
-from .const import DOMAIN, CONF_SUPPLY_ENTITIES, CONF_CONSUME_ENTITIES, CONF_HIDE_DEVICES_COLUMN
-from .coordinator import RoomPowerCoordinator
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    CONF_SUPPLY_ENTITIES,
+    CONF_CONSUME_ENTITIES,
+    CONF_HIDE_DEVICES_COLUMN,
+    CONF_PRICE_ENTITY,
+)
+from .coordinator import PowerSnapshot, RoomPowerCoordinator
 
 
 async def async_setup_entry(
@@ -24,8 +31,16 @@ async def async_setup_entry(
 
     sensors: List[SensorEntity] = []
 
+    def _cost_enabled() -> bool:
+        return bool({**entry.data, **entry.options}.get(CONF_PRICE_ENTITY))
+
     for area_name in coordinator.data.keys():
         sensors.append(RoomPowerSensor(coordinator, area_name))
+        if _cost_enabled():
+            sensors.append(RoomCostSensor(coordinator, area_name))
+
+    for floor_name in set(coordinator.room_floors.values()):
+        sensors.append(FloorPowerSensor(coordinator, floor_name))
 
     total_sensor = TotalPowerSensor(coordinator)
     sensors.append(total_sensor)
@@ -36,6 +51,9 @@ async def async_setup_entry(
     sankey_tree_sensor = RoomPowerSankeyTreeSensor(coordinator)
     sensors.append(sankey_tree_sensor)
 
+    if _cost_enabled():
+        sensors.append(HouseCostSensor(coordinator))
+
     async_add_entities(sensors)
 
     @callback
@@ -44,9 +62,30 @@ async def async_setup_entry(
         new_rooms = set(coordinator.data.keys())
         old_rooms = set(current_rooms.keys())
 
+        current_floors = {s.floor_name: s for s in sensors if isinstance(s, FloorPowerSensor)}
+        new_floors = set(coordinator.room_floors.values())
+        old_floors = set(current_floors.keys())
+
+        # cost sensors keyed by room name; None is the house cost sensor
+        current_costs = {
+            s.area_name: s for s in sensors if isinstance(s, (RoomCostSensor, HouseCostSensor))
+        }
+        new_costs = (new_rooms | {None}) if _cost_enabled() else set()
+        old_costs = set(current_costs.keys())
+
         for removed in old_rooms - new_rooms:
             s = current_rooms[removed]
-            s.async_remove()
+            hass.async_create_task(s.async_remove())
+            sensors.remove(s)
+
+        for removed in old_floors - new_floors:
+            s = current_floors[removed]
+            hass.async_create_task(s.async_remove())
+            sensors.remove(s)
+
+        for removed in old_costs - new_costs:
+            s = current_costs[removed]
+            hass.async_create_task(s.async_remove())
             sensors.remove(s)
 
         new_entities: List[SensorEntity] = []
@@ -55,12 +94,28 @@ async def async_setup_entry(
             sensors.append(ns)
             new_entities.append(ns)
 
+        for added in new_floors - old_floors:
+            ns = FloorPowerSensor(coordinator, added)
+            sensors.append(ns)
+            new_entities.append(ns)
+
+        for added in new_costs - old_costs:
+            ns = HouseCostSensor(coordinator) if added is None else RoomCostSensor(coordinator, added)
+            sensors.append(ns)
+            new_entities.append(ns)
+
         if new_entities:
             async_add_entities(new_entities)
 
         for name in new_rooms & old_rooms:
             current_rooms[name].async_write_ha_state()
 
+        for name in new_floors & old_floors:
+            current_floors[name].async_write_ha_state()
+
+        for name in new_costs & old_costs:
+            current_costs[name].async_write_ha_state()
+
         total_sensor.async_write_ha_state()
         unaccounted_sensor.async_write_ha_state()
         sankey_tree_sensor.async_write_ha_state()
@@ -87,18 +142,13 @@ class _BaseAggregatorSensor(SensorEntity):
             model="Power Aggregation Engine",
         )
 
-    def _state_to_watts(self, entity_id: str) -> float | None:
-        state = self.coordinator.hass.states.get(entity_id)
-        if state is None:
-            return None
-        try:
-            val = float(state.state)
-        except (ValueError, TypeError):
-            return None
-        unit = state.attributes.get("unit_of_measurement")
-        if unit == "kW":
-            val *= 1000.0
-        return val
+    @property
+    def _snapshot(self) -> PowerSnapshot:
+        snap = self.coordinator.snapshot
+        if snap is None:
+            # Only possible before the first refresh has completed.
+            return PowerSnapshot(timestamp=dt_util.utcnow())
+        return snap
 
 
 class RoomPowerSensor(_BaseAggregatorSensor):
@@ -108,6 +158,8 @@ class RoomPowerSensor(_BaseAggregatorSensor):
         "entities_count",
         "label_used",
         "filtered_by_label",
+        "source_entity_baseline_w",
+        "sub_meter_of",
     })
     def __init__(self, coordinator: RoomPowerCoordinator, area_name: str) -> None:
         super().__init__(coordinator)
@@ -121,22 +173,30 @@ class RoomPowerSensor(_BaseAggregatorSensor):
 
     @property
     def native_value(self) -> float:
-        entity_ids = self.coordinator.data.get(self.area_name, [])
-        total = 0.0
-        for entity_id in entity_ids:
-            watts = self._state_to_watts(entity_id)
-            if watts is None:
-                continue
-            total += watts
-        return round(total, 1)
+        return round(self._snapshot.room_totals_w.get(self.area_name, 0.0), 1)
 
     @property
     def extra_state_attributes(self) -> dict | None:
         src = self.coordinator.data.get(self.area_name, [])
         if not src:
             return None
-        power_values: Dict[str, float | None] = {eid: self._state_to_watts(eid) for eid in src}
-        return {"source_entities": list(src), "source_entity_power_w": power_values}
+        snap = self._snapshot
+        powers = snap.device_power_w
+        baselines = snap.device_baseline_w
+        baseline = snap.room_baseline_w.get(self.area_name)
+        return {
+            "source_entities": list(src),
+            "source_entity_power_w": {eid: powers.get(eid) for eid in src},
+            "baseline_w": round(baseline, 1) if baseline is not None else None,
+            "source_entity_baseline_w": {
+                eid: round(baselines[eid], 1) if baselines.get(eid) is not None else None for eid in src
+            },
+            "unavailable_sources": snap.unavailable_sources.get(self.area_name, []),
+            "sub_meter_of": {
+                eid: self.coordinator.meter_parents[eid] for eid in src if eid in self.coordinator.meter_parents
+            },
+            "degraded": self.area_name in snap.degraded_rooms,
+        }
 
     async def async_added_to_hass(self) -> None:
         await super().async_added_to_hass()
@@ -153,6 +213,80 @@ class RoomPowerSensor(_BaseAggregatorSensor):
             entity_reg.async_update_entity(ent_entry.entity_id, area_id=target_area.id)
 
 
+class FloorPowerSensor(_BaseAggregatorSensor):
+    """Sum of the (sub-meter netted) room totals on one floor."""
+
+    def __init__(self, coordinator: RoomPowerCoordinator, floor_name: str) -> None:
+        super().__init__(coordinator)
+        self.floor_name = floor_name
+        self._attr_name = f"{floor_name} Power Total"
+        self._attr_unique_id = f"{DOMAIN}_{coordinator.entry.entry_id}_floor_{floor_name}"
+
+    @property
+    def native_value(self) -> float:
+        return round(self._snapshot.floor_totals_w.get(self.floor_name, 0.0), 1)
+
+    @property
+    def extra_state_attributes(self) -> dict | None:
+        rooms = sorted(r for r, f in self.coordinator.room_floors.items() if f == self.floor_name)
+        totals = self._snapshot.room_totals_w
+        return {"rooms": rooms, "room_power_w": {r: round(totals.get(r, 0.0), 1) for r in rooms}}
+
+
+class _BaseCostSensor(_BaseAggregatorSensor):
+    """Accumulated energy cost, in the tariff entity's currency."""
+
+    _attr_device_class = SensorDeviceClass.MONETARY
+    _attr_state_class = SensorStateClass.TOTAL
+    area_name: str | None = None
+
+    @property
+    def native_unit_of_measurement(self) -> str | None:
+        return self._snapshot.currency or self.coordinator.hass.config.currency
+
+    def _cost_attributes(self, rate: float | None) -> dict:
+        snap = self._snapshot
+        return {
+            "cost_rate_per_h": round(rate, 4) if rate is not None else None,
+            "price_per_kwh": snap.price_per_kwh,
+        }
+
+
+class RoomCostSensor(_BaseCostSensor):
+    def __init__(self, coordinator: RoomPowerCoordinator, area_name: str) -> None:
+        super().__init__(coordinator)
+        self.area_name = area_name
+        self._attr_name = f"{area_name} Energy Cost"
+        self._attr_unique_id = f"{DOMAIN}_{coordinator.entry.entry_id}_cost_{area_name}"
+
+    @property
+    def suggested_area(self) -> str | None:
+        return self.area_name
+
+    @property
+    def native_value(self) -> float:
+        return round(self._snapshot.room_cost_total.get(self.area_name, 0.0), 4)
+
+    @property
+    def extra_state_attributes(self) -> dict | None:
+        return self._cost_attributes(self._snapshot.room_cost_rate.get(self.area_name))
+
+
+class HouseCostSensor(_BaseCostSensor):
+    def __init__(self, coordinator: RoomPowerCoordinator) -> None:
+        super().__init__(coordinator)
+        self._attr_name = "All Rooms Energy Cost"
+        self._attr_unique_id = f"{DOMAIN}_{coordinator.entry.entry_id}_cost_all_rooms"
+
+    @property
+    def native_value(self) -> float:
+        return round(self._snapshot.house_cost_total, 4)
+
+    @property
+    def extra_state_attributes(self) -> dict | None:
+        return self._cost_attributes(self._snapshot.house_cost_rate)
+
+
 class TotalPowerSensor(_BaseAggregatorSensor):
     def __init__(self, coordinator: RoomPowerCoordinator) -> None:
         super().__init__(coordinator)
@@ -161,26 +295,21 @@ class TotalPowerSensor(_BaseAggregatorSensor):
 
     @property
     def native_value(self) -> float:
-        all_entities: Set[str] = set()
-        for entity_ids in self.coordinator.data.values():
-            all_entities.update(entity_ids)
-        total = 0.0
-        for entity_id in all_entities:
-            watts = self._state_to_watts(entity_id)
-            if watts is None:
-                continue
-            total += watts
-        return round(total, 1)
+        return round(self._snapshot.house_w, 1)
 
     @property
     def extra_state_attributes(self) -> dict | None:
-        all_entities: Set[str] = set()
-        for entity_ids in self.coordinator.data.values():
-            all_entities.update(entity_ids)
-        if not all_entities:
+        snap = self._snapshot
+        powers = snap.device_power_w
+        if not powers:
             return None
-        power_values: Dict[str, float | None] = {eid: self._state_to_watts(eid) for eid in sorted(all_entities)}
-        return {"source_entities": sorted(all_entities), "source_entity_power_w": power_values}
+        all_entities = sorted(powers)
+        baseline = snap.house_baseline_w
+        return {
+            "source_entities": all_entities,
+            "source_entity_power_w": {eid: powers[eid] for eid in all_entities},
+            "baseline_w": round(baseline, 1) if baseline is not None else None,
+        }
 
 
 
@@ -192,29 +321,7 @@ class UnaccountedPowerSensor(_BaseAggregatorSensor):
 
     @property
     def native_value(self) -> float:
-        cfg = {**self.coordinator.entry.data, **self.coordinator.entry.options}
-        supply = cfg.get(CONF_SUPPLY_ENTITIES, []) or []
-        consume = cfg.get(CONF_CONSUME_ENTITIES, []) or []
-
-        supply_total = 0.0
-        for eid in supply:
-            w = self._state_to_watts(eid)
-            if w is None:
-                continue
-            supply_total += w
-
-        consume_total = 0.0
-        for eid in consume:
-            w = self._state_to_watts(eid)
-            if w is None:
-                continue
-            consume_total += w
-
-        house = float(TotalPowerSensor(self.coordinator).native_value)
-        unacc = supply_total - house - consume_total
-        if unacc < 0:
-            unacc = 0.0
-        return round(unacc, 1)
+        return round(self._snapshot.unaccounted_w, 1)
 
     @property
     def extra_state_attributes(self) -> dict | None:
@@ -240,16 +347,7 @@ class RoomPowerSankeyTreeSensor(_BaseAggregatorSensor):
     def native_value(self) -> float:
         # Show house total as the state
         # (keeps something useful in the UI; the card reads the attributes)
-        all_entities: Set[str] = set()
-        for entity_ids in self.coordinator.data.values():
-            all_entities.update(entity_ids)
-        total = 0.0
-        for eid in all_entities:
-            w = self._state_to_watts(eid)
-            if w is None:
-                continue
-            total += w
-        return round(total, 1)
+        return round(self._snapshot.house_w, 1)
 
     def _room_sensor_entity_id(self, room_name: str) -> str:
         ent_reg = er.async_get(self.hass)
@@ -259,6 +357,11 @@ class RoomPowerSankeyTreeSensor(_BaseAggregatorSensor):
                 return e.entity_id
         # fallback: best effort slug, but entity_id can be renamed by user
         return f"sensor.{room_name.lower().replace(' ', '_')}_power_total"
+    def _floor_sensor_entity_id(self, floor_name: str) -> str:
+        return self._special_sensor_entity_id(
+            f"floor_{floor_name}", f"sensor.{floor_name.lower().replace(' ', '_')}_power_total"
+        )
+
     def _special_sensor_entity_id(self, suffix: str, fallback: str) -> str:
         """Find our own sensor entity_id by unique_id suffix."""
         ent_reg = er.async_get(self.hass)
@@ -305,12 +408,22 @@ class RoomPowerSankeyTreeSensor(_BaseAggregatorSensor):
                     "room": rn,
                 }
 
+        floors = {}
+        for fn in sorted(set(self.coordinator.room_floors.values())):
+            floors[fn] = {
+                "entity_id": self._floor_sensor_entity_id(fn),
+                "rooms": sorted(r for r, f in self.coordinator.room_floors.items() if f == fn),
+            }
+        for rn in room_names:
+            rooms[rn]["floor"] = self.coordinator.room_floors.get(rn)
+
         # expose supply/consume defaults so user can omit them in card YAML
         supply = cfg.get(CONF_SUPPLY_ENTITIES, []) or []
         consume = cfg.get(CONF_CONSUME_ENTITIES, []) or []
 
         return {
             "rooms": rooms,
+            "floors": floors,
             "devices": devices,
             "hide_devices_column": hide_devices,
 
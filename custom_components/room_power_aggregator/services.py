@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .backfill import async_backfill_room_statistics
+from .const import (
+    DOMAIN,
+    SERVICE_GET_BREAKDOWN,
+    SERVICE_BACKFILL_STATISTICS,
+    ATTR_ENTRY_ID,
+    ATTR_TOP_N,
+    ATTR_START_TIME,
+    ATTR_END_TIME,
+    ATTR_ROOMS,
+    ATTR_TARGET,
+    DEFAULT_TOP_N,
+    BACKFILL_TARGET_EXTERNAL,
+    BACKFILL_TARGET_SENSOR,
+)
+from .coordinator import PowerSnapshot, RoomPowerCoordinator
+
+GET_BREAKDOWN_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_TOP_N, default=DEFAULT_TOP_N): vol.All(vol.Coerce(int), vol.Range(min=0)),
+    }
+)
+
+BACKFILL_STATISTICS_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_ENTRY_ID): cv.string,
+        vol.Required(ATTR_START_TIME): cv.datetime,
+        vol.Optional(ATTR_END_TIME): cv.datetime,
+        vol.Optional(ATTR_ROOMS): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_TARGET, default=BACKFILL_TARGET_EXTERNAL): vol.In(
+            [BACKFILL_TARGET_EXTERNAL, BACKFILL_TARGET_SENSOR]
+        ),
+    }
+)
+
+
+def _round(value: float | None, digits: int = 1) -> float | None:
+    return round(value, digits) if value is not None else None
+
+
+def _top_devices(powers: dict[str, float | None], entity_ids, top_n: int) -> list[dict[str, Any]]:
+    ranked = sorted(
+        ((eid, powers.get(eid)) for eid in entity_ids if powers.get(eid) is not None),
+        key=lambda item: item[1],
+        reverse=True,
+    )
+    return [{"entity_id": eid, "power_w": round(w, 1)} for eid, w in ranked[:top_n]]
+
+
+def build_breakdown(coordinator: RoomPowerCoordinator, snap: PowerSnapshot, top_n: int) -> dict[str, Any]:
+    """Serialize a snapshot into service response data (no state reads)."""
+    powers = snap.device_power_w
+    rooms = {
+        area_name: {
+            "total_w": round(total, 1),
+            "baseline_w": _round(snap.room_baseline_w.get(area_name)),
+            "degraded": area_name in snap.degraded_rooms,
+            "cost_rate_per_h": _round(snap.room_cost_rate.get(area_name), 4),
+            "cost_total": _round(snap.room_cost_total.get(area_name), 4),
+            "top_devices": _top_devices(powers, coordinator.data.get(area_name, []), top_n),
+        }
+        for area_name, total in sorted(snap.room_totals_w.items(), key=lambda kv: kv[1], reverse=True)
+    }
+    return {
+        "entry_id": coordinator.entry.entry_id,
+        "title": coordinator.entry.title,
+        "timestamp": snap.timestamp.isoformat(),
+        "house_w": round(snap.house_w, 1),
+        "supply_w": round(snap.supply_w, 1),
+        "consume_w": round(snap.consume_w, 1),
+        "unaccounted_w": round(snap.unaccounted_w, 1),
+        "baseline_w": _round(snap.house_baseline_w),
+        "price_per_kwh": snap.price_per_kwh,
+        "currency": snap.currency,
+        "cost_rate_per_h": round(snap.house_cost_rate, 4),
+        "cost_total": round(snap.house_cost_total, 4),
+        "floors": {name: round(total, 1) for name, total in sorted(snap.floor_totals_w.items())},
+        "rooms": rooms,
+        "top_devices": _top_devices(powers, powers.keys(), top_n),
+    }
+
+
+def _coordinators(hass: HomeAssistant, entry_id: str | None) -> list[RoomPowerCoordinator]:
+    loaded: dict[str, RoomPowerCoordinator] = hass.data.get(DOMAIN, {})
+    if entry_id is None:
+        return list(loaded.values())
+    if entry_id not in loaded:
+        raise ServiceValidationError(f"Room Power Aggregator entry {entry_id} is not loaded")
+    return [loaded[entry_id]]
+
+
+async def async_setup_services(hass: HomeAssistant) -> None:
+    """Register integration services (once, shared by all entries)."""
+    if hass.services.has_service(DOMAIN, SERVICE_GET_BREAKDOWN):
+        return
+
+    async def _get_breakdown(call: ServiceCall) -> ServiceResponse:
+        top_n = call.data[ATTR_TOP_N]
+        entries = []
+        for coordinator in _coordinators(hass, call.data.get(ATTR_ENTRY_ID)):
+            if coordinator.snapshot is None:
+                continue
+            entries.append(build_breakdown(coordinator, coordinator.snapshot, top_n))
+        return {"entries": entries}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_BREAKDOWN,
+        _get_breakdown,
+        schema=GET_BREAKDOWN_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    async def _backfill_statistics(call: ServiceCall) -> ServiceResponse:
+        start = dt_util.as_utc(call.data[ATTR_START_TIME])
+        end = dt_util.as_utc(call.data.get(ATTR_END_TIME) or dt_util.utcnow())
+        if start >= end:
+            raise ServiceValidationError("start_time must be before end_time")
+
+        entries = []
+        for coordinator in _coordinators(hass, call.data.get(ATTR_ENTRY_ID)):
+            hours = await async_backfill_room_statistics(
+                hass,
+                coordinator,
+                start,
+                end,
+                rooms=call.data.get(ATTR_ROOMS),
+                target=call.data[ATTR_TARGET],
+            )
+            entries.append({"entry_id": coordinator.entry.entry_id, "hours_imported": hours})
+        return {"entries": entries}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_BACKFILL_STATISTICS,
+        _backfill_statistics,
+        schema=BACKFILL_STATISTICS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+async def async_unload_services(hass: HomeAssistant) -> None:
+    """Remove integration services when the last entry is unloaded."""
+    hass.services.async_remove(DOMAIN, SERVICE_GET_BREAKDOWN)
+    hass.services.async_remove(DOMAIN, SERVICE_BACKFILL_STATISTICS)
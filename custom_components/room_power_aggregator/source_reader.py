@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING
+
+from .const import UNIT_FACTORS, UNAVAILABLE_POLICY_HOLD
+
+if TYPE_CHECKING:
+    from homeassistant.core import State
+
+_UNSET = object()
+
+
+class SourceReader:
+    """Cached watts reading of one source entity.
+
+    State objects are immutable and replaced on every change, so the parsed
+    value (unit factor and sign applied) is only recomputed when a different
+    State object is passed in; otherwise a read is an identity check.
+    """
+
+    __slots__ = ("entity_id", "sign", "_state", "_value", "_ok", "last_good", "bad_since")
+
+    def __init__(self, entity_id: str, sign: float = 1.0) -> None:
+        self.entity_id = entity_id
+        self.sign = sign
+        self._state: State | None | object = _UNSET
+        self._value: float | None = None
+        self._ok = False
+        self.last_good: float | None = None
+        self.bad_since: datetime | None = None
+
+    @property
+    def available(self) -> bool:
+        return self._ok
+
+    def _parse(self, state: State | None, now: datetime) -> None:
+        self._state = state
+        self._value = None
+        if state is not None:
+            try:
+                raw = float(state.state)
+            except (ValueError, TypeError):
+                raw = None
+            if raw is not None:
+                factor = UNIT_FACTORS.get(state.attributes.get("unit_of_measurement"), 1.0)
+                self._value = raw * factor * self.sign
+
+        if self._value is not None:
+            self._ok = True
+            self.last_good = self._value
+            self.bad_since = None
+        else:
+            if self._ok or self.bad_since is None:
+                self.bad_since = state.last_changed if state is not None else now
+            self._ok = False
+
+    def read(self, state: State | None, now: datetime, policy: str, hold_for: timedelta) -> float | None:
+        """Watts for `state`, or the held last-good value, or None when missing."""
+        if state is not self._state:
+            self._parse(state, now)
+        if self._ok:
+            return self._value
+        if (
+            policy == UNAVAILABLE_POLICY_HOLD
+            and self.last_good is not None
+            and now - self.bad_since <= hold_for
+        ):
+            return self.last_good
+        return None
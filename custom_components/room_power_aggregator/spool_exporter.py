@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+import logging
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .const import (
+    DOMAIN,
+    EXPORT_FORMAT_CSV,
+    EXPORT_FORMAT_LINE_PROTOCOL,
+    SPOOL_FLUSH_BYTES,
+    SPOOL_FLUSH_SECONDS,
+    SPOOL_ROTATE_BYTES,
+    SPOOL_ROTATE_SECONDS,
+    SPOOL_MAX_BUFFER_BYTES,
+)
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+CSV_HEADER = "timestamp,kind,room,entity_id,power_w\n"
+
+_SUFFIX = {EXPORT_FORMAT_LINE_PROTOCOL: "lp", EXPORT_FORMAT_CSV: "csv"}
+
+
+def _lp_tag(value: str) -> str:
+    return value.replace("\\", "\\\\").replace(",", "\\,").replace("=", "\\=").replace(" ", "\\ ")
+
+
+def _csv_field(value: str) -> str:
+    if any(c in value for c in ',"\n'):
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+
+def format_snapshot(snapshot, entry_id: str, rooms: dict[str, list[str]], fmt: str, include_devices: bool) -> str:
+    """Render one snapshot as line protocol or CSV rows (newline terminated)."""
+    lines: list[str] = []
+
+    if fmt == EXPORT_FORMAT_LINE_PROTOCOL:
+        ts = int(snapshot.timestamp.timestamp() * 1_000_000_000)
+        entry_tag = "entry=" + _lp_tag(entry_id)
+        lines.append(
+            f"house_power,{entry_tag} power_w={snapshot.house_w},supply_w={snapshot.supply_w},"
+            f"consume_w={snapshot.consume_w},unaccounted_w={snapshot.unaccounted_w} {ts}"
+        )
+        for floor, total in snapshot.floor_totals_w.items():
+            lines.append(f"floor_power,{entry_tag},floor={_lp_tag(floor)} power_w={total} {ts}")
+        for room, total in snapshot.room_totals_w.items():
+            lines.append(f"room_power,{entry_tag},room={_lp_tag(room)} power_w={total} {ts}")
+        if include_devices:
+            for room, entity_ids in rooms.items():
+                for eid in entity_ids:
+                    w = snapshot.device_power_w.get(eid)
+                    if w is None:
+                        continue
+                    lines.append(
+                        f"device_power,{entry_tag},room={_lp_tag(room)},entity_id={_lp_tag(eid)} power_w={w} {ts}"
+                    )
+        return "\n".join(lines) + "\n"
+
+    ts = snapshot.timestamp.isoformat()
+    lines.append(f"{ts},house,,,{snapshot.house_w}")
+    lines.append(f"{ts},supply,,,{snapshot.supply_w}")
+    lines.append(f"{ts},consume,,,{snapshot.consume_w}")
+    lines.append(f"{ts},unaccounted,,,{snapshot.unaccounted_w}")
+    for floor, total in snapshot.floor_totals_w.items():
+        lines.append(f"{ts},floor,{_csv_field(floor)},,{total}")
+    for room, total in snapshot.room_totals_w.items():
+        lines.append(f"{ts},room,{_csv_field(room)},,{total}")
+    if include_devices:
+        for room, entity_ids in rooms.items():
+            for eid in entity_ids:
+                w = snapshot.device_power_w.get(eid)
+                if w is None:
+                    continue
+                lines.append(f"{ts},device,{_csv_field(room)},{eid},{w}")
+    return "\n".join(lines) + "\n"
+
+
+class SnapshotSpool:
+    """Append-only local spool of aggregated snapshots for an external shipper.
+
+    Rendered snapshots are buffered in memory and written in one executor job
+    once SPOOL_FLUSH_BYTES or SPOOL_FLUSH_SECONDS is reached. The active file
+    is `<entry_id>.current.<ext>`; once it grows past SPOOL_ROTATE_BYTES or is
+    older than SPOOL_ROTATE_SECONDS, and when the spool is closed, it is
+    renamed to `<entry_id>-<utc timestamp>.<ext>`, which is what a shipper
+    should pick up. An active file left behind by a crash is rotated on the
+    first write. While a write is in flight the buffer keeps growing up to
+    SPOOL_MAX_BUFFER_BYTES, after which the oldest snapshots are dropped.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, fmt: str, include_devices: bool) -> None:
+        self.hass = hass
+        self.entry_id = entry_id
+        self.fmt = fmt
+        self.include_devices = include_devices
+        self.directory = Path(hass.config.path(DOMAIN, "spool"))
+        self.dropped = 0
+
+        self._buffer: list[str] = []
+        self._buffer_bytes = 0
+        self._last_flush = time.monotonic()
+        self._flush_task: asyncio.Task | None = None
+        # monotonic time the active file was started; only touched in executor jobs
+        self._active_since: float | None = None
+
+    @property
+    def _current_path(self) -> Path:
+        return self.directory / f"{self.entry_id}.current.{_SUFFIX[self.fmt]}"
+
+    def async_append(self, snapshot, rooms: dict[str, list[str]]) -> None:
+        """Buffer a snapshot and start a flush when a threshold is hit."""
+        chunk = format_snapshot(snapshot, self.entry_id, rooms, self.fmt, self.include_devices)
+        self._buffer.append(chunk)
+        self._buffer_bytes += len(chunk)
+
+        if self._flush_task is not None and not self._flush_task.done():
+            while self._buffer_bytes > SPOOL_MAX_BUFFER_BYTES and len(self._buffer) > 1:
+                self._buffer_bytes -= len(self._buffer.pop(0))
+                self.dropped += 1
+                if self.dropped == 1 or self.dropped % 100 == 0:
+                    _LOGGER.warning(
+                        "Spool writer for %s is falling behind, %s snapshots dropped",
+                        self.entry_id,
+                        self.dropped,
+                    )
+            return
+
+        if (
+            self._buffer_bytes >= SPOOL_FLUSH_BYTES
+            or time.monotonic() - self._last_flush >= SPOOL_FLUSH_SECONDS
+        ):
+            self._start_flush()
+
+    def _start_flush(self) -> None:
+        data = "".join(self._buffer)
+        self._buffer = []
+        self._buffer_bytes = 0
+        self._last_flush = time.monotonic()
+        self._flush_task = self.hass.async_create_background_task(
+            self._async_write(data),
+            name=f"{DOMAIN} spool flush {self.entry_id}",
+        )
+
+    async def _async_write(self, data: str) -> None:
+        await self.hass.async_add_executor_job(self._write, data)
+
+    def _write(self, data: str) -> None:
+        """Executor: append one chunk and rotate the active file if it is full or old."""
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path = self._current_path
+            if self._active_since is None and path.exists():
+                self._rotate()
+            new_file = not path.exists()
+            if new_file:
+                self._active_since = time.monotonic()
+            with path.open("a", encoding="utf-8") as fh:
+                if new_file and self.fmt == EXPORT_FORMAT_CSV:
+                    fh.write(CSV_HEADER)
+                fh.write(data)
+                size = fh.tell()
+            if size >= SPOOL_ROTATE_BYTES or time.monotonic() - self._active_since >= SPOOL_ROTATE_SECONDS:
+                self._rotate()
+        except OSError as err:
+            _LOGGER.error("Failed to write power spool %s: %s", self._current_path, err)
+
+    def _rotate(self) -> None:
+        """Executor: hand the active file over to the shipper."""
+        path = self._current_path
+        self._active_since = None
+        if not path.exists():
+            return
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+        path.rename(self.directory / f"{self.entry_id}-{stamp}.{_SUFFIX[self.fmt]}")
+
+    def _rotate_safe(self) -> None:
+        try:
+            self._rotate()
+        except OSError as err:
+            _LOGGER.error("Failed to rotate power spool %s: %s", self._current_path, err)
+
+    async def async_close(self) -> None:
+        """Wait for an in-flight write, flush what is buffered and rotate the active file."""
+        if self._flush_task is not None:
+            await self._flush_task
+        if self._buffer:
+            data = "".join(self._buffer)
+            self._buffer = []
+            self._buffer_bytes = 0
+            await self._async_write(data)
+        await self.hass.async_add_executor_job(self._rotate_safe)
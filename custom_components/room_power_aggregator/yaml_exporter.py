@@ -37,11 +37,19 @@ def build_sankey_yaml(
     room_totals: dict[str, str],
     rooms_to_device_entities: dict[str, list[str]],
     hide_devices_column: bool,
+    floor_totals: dict[str, str] | None = None,
+    room_floors: dict[str, str] | None = None,
 ) -> str:
     """Build Sankey YAML in v4 format (ha-sankey-chart 4.0.0+).
 
     v4 uses flat nodes[] with section index + separate links[] array.
+    When floors are known they get their own section between house and rooms.
     """
+    floor_totals = floor_totals or {}
+    room_floors = room_floors or {}
+    floor_section = 2 if floor_totals else None
+    room_section = 3 if floor_totals else 2
+    device_section = room_section + 1
 
     def _room_color(room_name: str) -> str:
         h = hashlib.sha1(room_name.casefold().encode("utf-8")).hexdigest()
@@ -57,8 +65,9 @@ def build_sankey_yaml(
 
     # Section 0: SUPPLY
     # Section 1: CONSUME + HOUSE + UNACCOUNTED
-    # Section 2: ROOMS
-    # Section 3: DEVICES (optional)
+    # Section 2: FLOORS (only when areas are assigned to floors)
+    # Section 2/3: ROOMS
+    # Section 3/4: DEVICES (optional)
 
     # --- SUPPLY nodes (section 0) ---
     for eid in supply_entities:
@@ -97,25 +106,38 @@ def build_sankey_yaml(
                 "    target: " + target,
             ]
 
-    # --- ROOM nodes (section 2) ---
+    # --- FLOOR nodes + HOUSE → FLOOR links (section 2, optional) ---
+    for floor_name in sorted(floor_totals.keys(), key=lambda s: s.casefold()):
+        nodes += [
+            "  - id: " + floor_totals[floor_name],
+            f"    section: {floor_section}",
+            "    name: " + floor_name,
+        ]
+        links += [
+            "  - source: " + house_total_entity_id,
+            "    target: " + floor_totals[floor_name],
+        ]
+
+    # --- ROOM nodes ---
     for area_name in sorted(room_totals.keys(), key=lambda s: s.casefold()):
         room_eid = room_totals[area_name]
         room_color = _room_color(area_name)
         nodes += [
             "  - id: " + room_eid,
-            "    section: 2",
+            f"    section: {room_section}",
             "    name: " + area_name,
             "    color: '" + room_color + "'",
         ]
 
-    # --- HOUSE → ROOM links ---
+    # --- HOUSE/FLOOR → ROOM links ---
     for area_name in sorted(room_totals.keys(), key=lambda s: s.casefold()):
+        parent = floor_totals.get(room_floors.get(area_name), house_total_entity_id)
         links += [
-            "  - source: " + house_total_entity_id,
+            "  - source: " + parent,
             "    target: " + room_totals[area_name],
         ]
 
-    # --- DEVICE nodes + links (section 3, optional) ---
+    # --- DEVICE nodes + links (last section, optional) ---
     if not hide_devices_column:
         for area_name in sorted(room_totals.keys(), key=lambda s: s.casefold()):
             room_color = _room_color(area_name)
@@ -123,7 +145,7 @@ def build_sankey_yaml(
             for dev in sorted(rooms_to_device_entities.get(area_name, []), key=lambda s: s.casefold()):
                 nodes += [
                     "  - id: " + dev,
-                    "    section: 3",
+                    f"    section: {device_section}",
                     "    name: " + _pretty_name(dev),
                     "    color: '" + room_color + "'",
                 ]
@@ -0,0 +1,118 @@
+import asyncio
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.room_power_aggregator.baseline import BaselineEstimator, BaselineTracker
+from custom_components.room_power_aggregator.const import (
+    BASELINE_WARMUP_SAMPLES,
+    BASELINE_WINDOW_SAMPLES,
+)
+
+
+def _steady_state(signal, samples=40_000):
+    est = BaselineEstimator()
+    values = []
+    for i in range(samples):
+        est.update(signal())
+        if i >= samples // 2:
+            values.append(est.value)
+    return min(values), max(values)
+
+
+@pytest.mark.parametrize("duty", [0.6, 0.9])
+def test_duty_cycled_load_reports_standby(duty):
+    rng = random.Random(1)
+
+    def signal():
+        return rng.uniform(1500, 2000) if rng.random() < duty else rng.uniform(3, 4)
+
+    lo, hi = _steady_state(signal)
+    assert lo >= 3.0
+    assert hi < 20.0
+
+
+def test_block_duty_cycle_like_a_fridge():
+    rng = random.Random(2)
+    tick = iter(range(10**9))
+
+    def signal():
+        # 20 min on, 10 min off at one sample per 5 s
+        return rng.uniform(100, 120) if next(tick) % 360 < 240 else rng.uniform(3, 4)
+
+    lo, hi = _steady_state(signal, 60_000)
+    assert 3.0 <= lo and hi < 6.0
+
+
+def test_never_below_observed_minimum():
+    est = BaselineEstimator()
+    for i in range(BASELINE_WARMUP_SAMPLES * 5):
+        est.update(3.0 if i % 10 == 0 else 2000.0)
+        assert est.value >= 3.0
+
+
+def test_follows_a_lower_baseline():
+    rng = random.Random(3)
+    est = BaselineEstimator()
+    for _ in range(20_000):
+        est.update(100 + rng.gauss(0, 2))
+    for _ in range(2_000):
+        est.update(40 + rng.gauss(0, 2))
+    assert 30 < est.value < 45
+
+
+@pytest.mark.parametrize(("before", "after"), [(0.0, 60.0), (5.0, 105.0)])
+def test_follows_a_higher_baseline_after_a_flat_period(before, after):
+    rng = random.Random(4)
+    est = BaselineEstimator()
+    for _ in range(17_280):  # one day at 5 s
+        est.update(before)
+    for _ in range(2 * BASELINE_WINDOW_SAMPLES):
+        est.update(after + rng.uniform(0, 1))
+    assert after - 1 <= est.value <= after + 1
+
+
+def test_roundtrip_and_legacy_checkpoint_without_minimum():
+    est = BaselineEstimator()
+    for x in (10.0, 5.0, 50.0):
+        est.update(x)
+    restored = BaselineEstimator.from_dict(est.as_dict())
+    assert restored.as_dict() == est.as_dict()
+
+    legacy = BaselineEstimator.from_dict({"e": 7.0, "s": 1.0, "l": 8.0, "n": 5})
+    assert legacy.minimum == 7.0
+    assert legacy.window_count == 0
+
+
+def test_tracker_delay_saves_once_and_prunes_vanished_sources(fake_store):
+    store = fake_store({"entities": {"sensor.gone": {"e": 1, "s": 1, "l": 1, "n": 1}}})
+    tracker = BaselineTracker(store)
+    asyncio.run(tracker.async_load())
+
+    for _ in range(3):
+        snap = SimpleNamespace(
+            device_power_w={"sensor.tv": 5.0, "sensor.off": None},
+            room_totals_w={"Living": 5.0},
+            house_w=5.0,
+            device_baseline_w={},
+            room_baseline_w={},
+            house_baseline_w=None,
+        )
+        tracker.update(snap)
+
+    assert len(store.delayed) == 1
+    data = store.delayed[0]()
+    assert set(data["entities"]) == {"sensor.tv"}
+    assert set(data["rooms"]) == {"Living"}
+    assert snap.room_baseline_w == {"Living": 5.0}
+
+    tracker.update(snap)
+    assert len(store.delayed) == 2
+
+
+def test_tracker_does_not_overwrite_before_load(fake_store):
+    store = fake_store({"house": {"e": 1, "s": 1, "l": 1, "n": 1}})
+    tracker = BaselineTracker(store)
+    asyncio.run(tracker.async_save())
+    assert store.saved == []
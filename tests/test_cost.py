@@ -0,0 +1,92 @@
+import asyncio
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.room_power_aggregator.cost import CostTracker, parse_price
+
+
+def _snapshot(t0, seconds, rooms, house):
+    return SimpleNamespace(timestamp=t0 + timedelta(seconds=seconds), room_totals_w=rooms, house_w=house)
+
+
+@pytest.mark.parametrize(
+    ("value", "unit", "expected"),
+    [
+        ("0.25", "EUR/kWh", (0.25, "EUR")),
+        ("250", "EUR/MWh", (0.25, "EUR")),
+        ("0.0003", "USD/Wh", (pytest.approx(0.3), "USD")),
+        ("0.25", "€/kWh", (0.25, "CHF")),
+        ("0.25", None, (0.25, "CHF")),
+        ("0.25", "EUR", (0.25, "EUR")),
+        ("25", "ct/kWh", (0.25, "CHF")),
+        ("25", "c/kWh", (0.25, "CHF")),
+        ("25", "cent/kWh", (0.25, "CHF")),
+        ("25", "öre/kWh", (0.25, "CHF")),
+        ("25", "øre/kWh", (0.25, "CHF")),
+        ("25", "p/kWh", (0.25, "CHF")),
+        ("2.5", "kr/kWh", (2.5, "CHF")),
+        ("25", "usd/kWh", (None, "CHF")),
+        ("25", "ÄÖÜ/kWh", (None, "CHF")),
+        ("25", "EUR/therm", (None, "CHF")),
+        ("unavailable", "EUR/kWh", (None, "CHF")),
+    ],
+)
+def test_parse_price(make_state, value, unit, expected):
+    assert parse_price(make_state(value, unit), "CHF") == expected
+
+
+def test_parse_price_without_state():
+    assert parse_price(None, "CHF") == (None, "CHF")
+
+
+def test_cost_integrates_previous_rates(fake_store, t0):
+    tracker = CostTracker(fake_store())
+    asyncio.run(tracker.async_load())
+
+    first = _snapshot(t0, 0, {"Office": 1000.0}, 1500.0)
+    tracker.update(first, 0.36, "EUR")
+    assert first.room_cost_rate == {"Office": pytest.approx(0.36)}
+    assert first.house_cost_rate == pytest.approx(0.54)
+    assert first.room_cost_total == {"Office": 0.0}
+
+    second = _snapshot(t0, 10, {"Office": 0.0}, 500.0)
+    tracker.update(second, 0.36, "EUR")
+    assert second.room_cost_total == {"Office": pytest.approx(0.001)}
+    assert second.house_cost_total == pytest.approx(0.0015)
+    assert second.room_cost_rate == {"Office": 0.0}
+
+
+def test_long_gap_and_missing_price_are_not_charged(fake_store, t0):
+    tracker = CostTracker(fake_store())
+    asyncio.run(tracker.async_load())
+    tracker.update(_snapshot(t0, 0, {"Office": 1000.0}, 1000.0), 0.36, "EUR")
+    tracker.update(_snapshot(t0, 3600, {"Office": 1000.0}, 1000.0), None, "EUR")
+    last = _snapshot(t0, 3605, {"Office": 1000.0}, 1000.0)
+    tracker.update(last, 0.36, "EUR")
+    assert last.house_cost_total == 0.0
+
+
+def test_totals_restored_and_saved_through_delay_save(fake_store, t0):
+    store = fake_store({"rooms": {"Office": 1.5}, "house": 2.0})
+    tracker = CostTracker(store)
+    asyncio.run(tracker.async_load())
+
+    tracker.update(_snapshot(t0, 0, {"Office": 1000.0}, 1000.0), 0.36, "EUR")
+    tracker.update(_snapshot(t0, 5, {"Office": 1000.0}, 1000.0), 0.36, "EUR")
+    assert len(store.delayed) == 1
+    data = store.delayed[0]()
+    assert data["rooms"]["Office"] == pytest.approx(1.5005)
+    assert data["house"] == pytest.approx(2.0005)
+
+    tracker.update(_snapshot(t0, 10, {"Office": 1000.0}, 1000.0), 0.36, "EUR")
+    assert len(store.delayed) == 2
+
+
+def test_no_overwrite_before_load(fake_store, t0):
+    store = fake_store({"rooms": {"Office": 1.5}, "house": 2.0})
+    tracker = CostTracker(store)
+    tracker.update(_snapshot(t0, 0, {"Office": 1000.0}, 1000.0), 0.36, "EUR")
+    asyncio.run(tracker.async_save())
+    assert store.delayed == [] and store.saved == []
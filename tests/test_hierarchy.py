@@ -0,0 +1,48 @@
+from custom_components.room_power_aggregator.hierarchy import PowerTree
+
+ROOMS = {
+    "Kitchen": ["sensor.main_meter", "sensor.fridge"],
+    "Office": ["sensor.office_meter"],
+    "Bedroom": ["sensor.lamp"],
+}
+FLOORS = {"Kitchen": "Ground", "Office": "Ground", "Bedroom": "First"}
+# the office circuit is metered separately and also counted by the main meter
+PARENTS = {"sensor.office_meter": "sensor.main_meter"}
+
+
+def _totals(tree):
+    return {room: tree.room_total(room) for room in ROOMS}
+
+
+def test_sub_meter_in_later_room_is_netted_in_the_same_refresh():
+    tree = PowerTree(ROOMS, FLOORS, PARENTS)
+    tree.update({"sensor.main_meter": 1000.0, "sensor.fridge": 0.0, "sensor.office_meter": 200.0, "sensor.lamp": 0.0})
+
+    assert _totals(tree) == {"Kitchen": 800.0, "Office": 200.0, "Bedroom": 0.0}
+    assert tree.house_total == 1000.0
+    assert sum(_totals(tree).values()) == tree.house_total
+
+    tree.update({"sensor.main_meter": 1000.0, "sensor.fridge": 0.0, "sensor.office_meter": 500.0, "sensor.lamp": 0.0})
+    assert _totals(tree) == {"Kitchen": 500.0, "Office": 500.0, "Bedroom": 0.0}
+    assert tree.house_total == 1000.0
+
+
+def test_floor_totals_follow_room_changes():
+    tree = PowerTree(ROOMS, FLOORS, PARENTS)
+    tree.update({"sensor.main_meter": 600.0, "sensor.fridge": 90.0, "sensor.office_meter": 100.0, "sensor.lamp": 40.0})
+    assert tree.floor_total("Ground") == 690.0
+    assert tree.floor_total("First") == 40.0
+
+    tree.set("sensor.lamp", 0.0)
+    tree.set("sensor.fridge", 0.0)
+    assert tree.floor_total("Ground") == 600.0
+    assert tree.floor_total("First") == 0.0
+    assert tree.house_total == 600.0
+    assert tree.floor_total("Attic") == 0.0
+
+
+def test_room_without_floor_counts_towards_house_only():
+    tree = PowerTree({"Garage": ["sensor.charger"]}, {}, {})
+    tree.set("sensor.charger", 7400.0)
+    assert tree.room_total("Garage") == 7400.0
+    assert tree.house_total == 7400.0
@@ -0,0 +1,82 @@
+from datetime import timedelta
+
+import pytest
+
+from custom_components.room_power_aggregator.const import (
+    UNAVAILABLE_POLICY_HOLD,
+    UNAVAILABLE_POLICY_ZERO,
+)
+from custom_components.room_power_aggregator.power_history import hourly_group_power
+
+@pytest.fixture
+def row(t0):
+    """Compressed recorder row (compressed_state_format=True) `minutes` after t0."""
+
+    def _row(value, minutes):
+        return {"s": value, "lu": (t0 + timedelta(minutes=minutes)).timestamp()}
+
+    return _row
+
+
+def test_time_weighted_mean_min_max(row, t0):
+    states = {"sensor.a": [row("100", -10), row("300", 30)]}
+    [hour] = hourly_group_power(states, [("sensor.a", 1.0)], {}, t0, t0 + timedelta(hours=1))
+    assert hour.start == t0
+    assert hour.mean == 200.0
+    assert (hour.min, hour.max) == (100.0, 300.0)
+
+
+def test_sub_meter_is_subtracted_and_unit_factor_applied(row, t0):
+    states = {
+        "sensor.parent": [row("1", -60)],  # kW
+        "sensor.child": [row("200", -60)],
+    }
+    members = [("sensor.parent", 1.0), ("sensor.child", -1.0)]
+    rows = hourly_group_power(states, members, {"sensor.parent": 1000.0}, t0, t0 + timedelta(hours=2))
+    assert [r.mean for r in rows] == [800.0, 800.0]
+
+
+def test_unavailable_counts_as_zero_by_default(row, t0):
+    states = {"sensor.a": [row("100", -10), row("unavailable", 30)]}
+    [hour] = hourly_group_power(
+        states, [("sensor.a", 1.0)], {}, t0, t0 + timedelta(hours=1), UNAVAILABLE_POLICY_ZERO
+    )
+    assert hour.mean == 50.0
+    assert hour.min == 0.0
+
+
+def test_hold_policy_keeps_last_value_until_timeout(row, t0):
+    states = {"sensor.a": [row("100", -10), row("unavailable", 10), row("unknown", 20)]}
+    [hour] = hourly_group_power(
+        states,
+        [("sensor.a", 1.0)],
+        {},
+        t0,
+        t0 + timedelta(hours=1),
+        UNAVAILABLE_POLICY_HOLD,
+        timedelta(minutes=20),
+    )
+    # held from minute 10 until 30, then 0
+    assert hour.mean == 50.0
+
+
+def test_hold_policy_recovers_before_timeout(row, t0):
+    states = {"sensor.a": [row("100", -10), row("unavailable", 10), row("100", 15)]}
+    [hour] = hourly_group_power(
+        states,
+        [("sensor.a", 1.0)],
+        {},
+        t0,
+        t0 + timedelta(hours=1),
+        UNAVAILABLE_POLICY_HOLD,
+        timedelta(minutes=20),
+    )
+    assert hour.mean == 100.0
+    assert hour.min == 100.0
+
+
+def test_hours_across_chunk_boundary_start_on_the_hour(row, t0):
+    states = {"sensor.a": [row("60", -30), row("120", 90)]}
+    rows = hourly_group_power(states, [("sensor.a", 1.0)], {}, t0, t0 + timedelta(hours=3))
+    assert [r.start for r in rows] == [t0 + timedelta(hours=h) for h in range(3)]
+    assert [r.mean for r in rows] == [60.0, 90.0, 120.0]
@@ -0,0 +1,53 @@
+from datetime import timedelta
+
+from custom_components.room_power_aggregator.const import (
+    UNAVAILABLE_POLICY_HOLD,
+    UNAVAILABLE_POLICY_ZERO,
+)
+from custom_components.room_power_aggregator.source_reader import SourceReader
+
+HOLD = timedelta(minutes=5)
+
+
+def test_unit_factor_and_sign(make_state, t0):
+    assert SourceReader("sensor.a").read(make_state("1.5", "kW"), t0, UNAVAILABLE_POLICY_ZERO, HOLD) == 1500.0
+    assert SourceReader("sensor.a").read(make_state("2", "MW"), t0, UNAVAILABLE_POLICY_ZERO, HOLD) == 2_000_000.0
+    assert SourceReader("sensor.a").read(make_state("500", "mW"), t0, UNAVAILABLE_POLICY_ZERO, HOLD) == 0.5
+    assert SourceReader("sensor.a", -1.0).read(make_state("40", "W"), t0, UNAVAILABLE_POLICY_ZERO, HOLD) == -40.0
+
+
+def test_value_is_cached_per_state_object(make_state, t0):
+    reader = SourceReader("sensor.a")
+    state = make_state("10", "W")
+    assert reader.read(state, t0, UNAVAILABLE_POLICY_ZERO, HOLD) == 10.0
+    state.state = "99"  # same object: not re-parsed
+    assert reader.read(state, t0, UNAVAILABLE_POLICY_ZERO, HOLD) == 10.0
+    assert reader.read(make_state("99", "W"), t0, UNAVAILABLE_POLICY_ZERO, HOLD) == 99.0
+
+
+def test_missing_source(t0):
+    reader = SourceReader("sensor.a")
+    assert reader.read(None, t0, UNAVAILABLE_POLICY_HOLD, HOLD) is None
+    assert not reader.available
+
+
+def test_zero_policy_drops_unavailable_source(make_state, t0):
+    reader = SourceReader("sensor.a")
+    reader.read(make_state("10", "W"), t0, UNAVAILABLE_POLICY_ZERO, HOLD)
+    assert reader.read(make_state("unavailable", None, 10), t0, UNAVAILABLE_POLICY_ZERO, HOLD) is None
+    assert not reader.available
+
+
+def test_hold_policy_times_out_from_first_bad_state(make_state, t0):
+    reader = SourceReader("sensor.a")
+    reader.read(make_state("10", "W"), t0, UNAVAILABLE_POLICY_HOLD, HOLD)
+
+    unavailable = make_state("unavailable", None, 60)
+    assert reader.read(unavailable, t0 + timedelta(minutes=2), UNAVAILABLE_POLICY_HOLD, HOLD) == 10.0
+    # a second bad state does not restart the timeout
+    unknown = make_state("unknown", None, 240)
+    assert reader.read(unknown, t0 + timedelta(minutes=5), UNAVAILABLE_POLICY_HOLD, HOLD) == 10.0
+    assert reader.read(unknown, t0 + timedelta(minutes=7), UNAVAILABLE_POLICY_HOLD, HOLD) is None
+
+    assert reader.read(make_state("12", "W", 500), t0 + timedelta(minutes=9), UNAVAILABLE_POLICY_HOLD, HOLD) == 12.0
+    assert reader.available
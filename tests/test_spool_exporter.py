@@ -0,0 +1,98 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.room_power_aggregator import spool_exporter
+from custom_components.room_power_aggregator.const import (
+    EXPORT_FORMAT_CSV,
+    EXPORT_FORMAT_LINE_PROTOCOL,
+)
+from custom_components.room_power_aggregator.spool_exporter import SnapshotSpool, format_snapshot
+
+ROOMS = {"Living Room": ["sensor.tv", "sensor.lamp"]}
+
+
+@pytest.fixture
+def snapshot(t0):
+    return SimpleNamespace(
+        timestamp=t0,
+        house_w=150.0,
+        supply_w=400.0,
+        consume_w=50.0,
+        unaccounted_w=200.0,
+        floor_totals_w={"Ground": 150.0},
+        room_totals_w={"Living Room": 150.0},
+        device_power_w={"sensor.tv": 150.0, "sensor.lamp": None},
+    )
+
+
+class _FakeHass:
+    def __init__(self, root):
+        self.config = SimpleNamespace(path=lambda *parts: str(root.joinpath(*parts)))
+
+    async def async_add_executor_job(self, func, *args):
+        return func(*args)
+
+    def async_create_background_task(self, coro, name):
+        return asyncio.ensure_future(coro)
+
+
+def test_line_protocol_escapes_tags_and_skips_missing_devices(snapshot):
+    text = format_snapshot(snapshot, "entry1", ROOMS, EXPORT_FORMAT_LINE_PROTOCOL, True)
+    lines = text.splitlines()
+    ts = "1704067200000000000"
+    assert lines[0] == (
+        f"house_power,entry=entry1 power_w=150.0,supply_w=400.0,consume_w=50.0,unaccounted_w=200.0 {ts}"
+    )
+    assert f"floor_power,entry=entry1,floor=Ground power_w=150.0 {ts}" in lines
+    assert f"room_power,entry=entry1,room=Living\\ Room power_w=150.0 {ts}" in lines
+    assert [l for l in lines if l.startswith("device_power")] == [
+        f"device_power,entry=entry1,room=Living\\ Room,entity_id=sensor.tv power_w=150.0 {ts}"
+    ]
+    assert text.endswith("\n")
+
+
+def test_csv_rows_without_devices(snapshot):
+    snapshot.room_totals_w = {"Kitchen, back": 10.0}
+    lines = format_snapshot(snapshot, "entry1", ROOMS, EXPORT_FORMAT_CSV, False).splitlines()
+    assert lines[0] == "2024-01-01T00:00:00+00:00,house,,,150.0"
+    assert '2024-01-01T00:00:00+00:00,room,"Kitchen, back",,10.0' in lines
+    assert not any(",device," in l for l in lines)
+
+
+def test_leftover_active_file_is_rotated_before_writing(tmp_path):
+    spool = SnapshotSpool(_FakeHass(tmp_path), "entry1", EXPORT_FORMAT_CSV, False)
+    spool.directory.mkdir(parents=True)
+    (spool.directory / "entry1.current.csv").write_text("old\n")
+
+    spool._write("new\n")
+
+    rotated = sorted(p for p in spool.directory.iterdir() if ".current." not in p.name)
+    assert [p.read_text() for p in rotated] == ["old\n"]
+    assert (spool.directory / "entry1.current.csv").read_text() == spool_exporter.CSV_HEADER + "new\n"
+
+
+def test_active_file_is_rotated_by_age(tmp_path, monkeypatch):
+    monkeypatch.setattr(spool_exporter, "SPOOL_ROTATE_SECONDS", 0)
+    spool = SnapshotSpool(_FakeHass(tmp_path), "entry1", EXPORT_FORMAT_LINE_PROTOCOL, False)
+
+    spool._write("a\n")
+
+    assert not (spool.directory / "entry1.current.lp").exists()
+    assert [p.read_text() for p in spool.directory.iterdir()] == ["a\n"]
+
+
+def test_close_flushes_and_rotates(tmp_path, snapshot):
+    spool = SnapshotSpool(_FakeHass(tmp_path), "entry1", EXPORT_FORMAT_LINE_PROTOCOL, False)
+
+    async def _run():
+        spool.async_append(snapshot, ROOMS)
+        await spool.async_close()
+
+    asyncio.run(_run())
+
+    files = list(spool.directory.iterdir())
+    assert len(files) == 1
+    assert files[0].name.startswith("entry1-") and files[0].suffix == ".lp"
+    assert files[0].read_text().startswith("house_power,")